@@ -29,6 +29,17 @@ try:
 except ImportError:
     OLLAMA_AVAILABLE = False
 
+# One ollama.Client per host, shared by every OllamaClient instance
+_SHARED_CLIENTS: Dict[str, Any] = {}
+
+
+def _shared_client(host: str):
+    """Return the process-wide ollama.Client for host, creating it once."""
+    client = _SHARED_CLIENTS.get(host)
+    if client is None:
+        client = _SHARED_CLIENTS.setdefault(host, ollama.Client(host=host))
+    return client
+
 # ── Load personality/style config from playbook/Personality.json ─────────────
 _PLAYBOOK_DIR = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
@@ -116,14 +127,13 @@ class OllamaClient:
             self.host = host or "http://localhost:11434"
             self.temperature = temperature if temperature is not None else 0.3
 
-        # Configure Ollama client
-        if self.host != "http://localhost:11434":
-            ollama.Client(host=self.host)
+        # Long-lived client per host so requests reuse pooled connections
+        self._client = _shared_client(self.host)
 
     def is_available(self) -> bool:
         """Check if Ollama is running and model is available."""
         try:
-            response = ollama.list()
+            response = self._client.list()
             # Handle both old dict format and new object format
             if hasattr(response, 'models'):
                 # New format: response.models is a list of Model objects
@@ -147,7 +157,7 @@ class OllamaClient:
             Generated text string
         """
         try:
-            response = ollama.generate(
+            response = self._client.generate(
                 model=self.model,
                 prompt=prompt,
                 options={
@@ -371,7 +381,7 @@ Respond in JSON format:
 }}"""
 
         try:
-            response = ollama.generate(
+            response = self._client.generate(
                 model=self.model,
                 prompt=prompt,
                 options={
@@ -475,7 +485,7 @@ Keep it concise and appropriate for business communication.
 Return ONLY the email body text, no subject line or headers."""
 
         try:
-            response = ollama.generate(
+            response = self._client.generate(
                 model=self.model,
                 prompt=prompt,
                 options={
@@ -14,33 +14,346 @@ Usage:
     await handler.send_response(chat_id, "Draft created!")
 """
 
+from __future__ import annotations
+
+import os
 import re
 import json
+import itertools
+import time
+import heapq
+import hashlib
 import asyncio
 import logging
 import html
-from typing import Dict, List, Optional, Any, Callable
-
-# Telegram library
+import importlib.util
+import functools
+import weakref
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Callable, Final, Set, TYPE_CHECKING
+
+# Telegram library - only probe for it here; the (heavy) import itself is
+# deferred to _import_telegram() so parse-only callers never pay for it
+TELEGRAM_AVAILABLE: Final[bool] = importlib.util.find_spec('telegram') is not None
+
+# Sibling modules used by the handlers, imported once here instead of on
+# every command; each client guards its own SDK import
+try:
+    from ollama_client import OllamaClient
+except ImportError:
+    OllamaClient = None
+try:
+    from kimi_client import KimiClient
+except ImportError:
+    KimiClient = None
+try:
+    from claude_client import ClaudeClient
+except ImportError:
+    ClaudeClient = None
 try:
+    from gmail_client import GmailClient
+except ImportError:
+    GmailClient = None
+try:
+    from llm_router import route_draft_request
+except ImportError:
+    route_draft_request = None
+try:
+    from m1_config import SMART_PARSER_ENABLED, GMAIL_TOKEN_PATH
+except ImportError:
+    SMART_PARSER_ENABLED = False
+    GMAIL_TOKEN_PATH = None
+
+if TYPE_CHECKING:
     from telegram import Update, Bot, InlineKeyboardButton, InlineKeyboardMarkup
     from telegram.constants import ChatAction
+    from telegram.error import RetryAfter
     from telegram.ext import Application, CommandHandler, MessageHandler, ContextTypes, filters, CallbackQueryHandler
-    TELEGRAM_AVAILABLE = True
-except ImportError:
-    TELEGRAM_AVAILABLE = False
-    # Provide stub types so method signatures don't crash at class-definition time
-    Update = None
-    ContextTypes = type('_Stub', (), {'DEFAULT_TYPE': None})()
+    from telegram.request import HTTPXRequest
+
+
+def _import_telegram():
+    """Import python-telegram-bot on first use and bind its names at module level."""
+    global Update, Bot, InlineKeyboardButton, InlineKeyboardMarkup, ChatAction
+    global Application, CommandHandler, MessageHandler, ContextTypes, filters, CallbackQueryHandler
+    global RetryAfter, HTTPXRequest
+    from telegram import Update, Bot, InlineKeyboardButton, InlineKeyboardMarkup
+    from telegram.constants import ChatAction
+    from telegram.error import RetryAfter
+    from telegram.ext import Application, CommandHandler, MessageHandler, ContextTypes, filters, CallbackQueryHandler
+    from telegram.request import HTTPXRequest
+
+
+def _make_request(connection_pool_size: int, read_timeout: float) -> 'HTTPXRequest':
+    """Build a pooled HTTPX transport, multiplexed over HTTP/2 when h2 is installed."""
+    http_version = "2" if importlib.util.find_spec('h2') is not None else "1.1"
+    return HTTPXRequest(
+        connection_pool_size=connection_pool_size,
+        pool_timeout=5.0,
+        connect_timeout=5.0,
+        read_timeout=read_timeout,
+        write_timeout=20.0,
+        http_version=http_version
+    )
 
 logger = logging.getLogger(__name__)
 
 
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to at most limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+
+def _split_message(text: str, limit: int) -> List[str]:
+    """Split text into parts of at most limit characters, preferably at line breaks."""
+    parts = []
+    while len(text) > limit:
+        cut = text.rfind('\n', 0, limit)
+        if cut <= 0:
+            cut = limit
+        parts.append(text[:cut])
+        text = text[cut:].lstrip('\n')
+    parts.append(text)
+    return parts
+
+
+# Tags (group 1: '/' when closing, group 2: name) and character entities in
+# Telegram HTML; neither may be cut
+_HTML_TOKEN_RE = re.compile(r'<(/?)([^\s/>]*)[^>]*>|&#?\w+;')
+
+
+def _split_html_message(text: str, limit: int) -> List[str]:
+    """
+    Split Telegram HTML into parts of at most limit characters.
+
+    Like _split_message, but never cuts inside a tag or entity. Tags open at
+    a cut are closed at the end of the part and reopened in the next, so
+    every part parses on its own.
+    """
+    parts = []
+    start, tags, reopen = 0, (), ''
+    while len(reopen) + len(text) - start > limit:
+        # Walk the safe cut points, tracking the open (name, tag) pairs and
+        # the length of the closing tags a cut there would need
+        pos, open_tags = start, tags
+        closing = sum(len(tag_name) + 3 for tag_name, _ in open_tags)
+        cut = newline_cut = None
+        while pos < len(text) and (pos == start or len(reopen) + pos - start + closing <= limit):
+            if pos > start:
+                cut = (pos, open_tags)
+                if text[pos] == '\n':
+                    newline_cut = cut
+            match = _HTML_TOKEN_RE.match(text, pos) if text[pos] in '<&' else None
+            if match is None:
+                pos += 1
+                continue
+            pos = match.end()
+            closing_slash, name = match.group(1, 2)
+            if closing_slash:
+                names = [tag_name for tag_name, _ in open_tags]
+                if name in names:
+                    open_tags = open_tags[:len(names) - 1 - names[::-1].index(name)]
+            elif name and not match.group().endswith('/>'):
+                open_tags += ((name, match.group()),)
+            else:
+                continue
+            closing = sum(len(tag_name) + 3 for tag_name, _ in open_tags)
+        # With no room for even one token, that token is taken anyway
+        pos, open_tags = newline_cut or cut or (pos, open_tags)
+        parts.append(
+            reopen + text[start:pos]
+            + ''.join(f'</{tag_name}>' for tag_name, _ in reversed(open_tags))
+        )
+        start = pos
+        while start < len(text) and text[start] == '\n':
+            start += 1
+        tags = open_tags
+        reopen = ''.join(tag for _, tag in open_tags)
+    parts.append(reopen + text[start:])
+    return parts
+
+
+def _install_uvloop() -> bool:
+    """Use uvloop for new event loops if it is installed (optional speedup)."""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+# Long-poll getUpdates for up to this many seconds per request
+_POLL_TIMEOUT = 30
+# HTTP pool for outbound bot calls (PTB's default of 8 stalls under fan-out)
+_CONNECTION_POOL_SIZE = 256
+# Outbound send backlog cap (senders wait for space when it is full)
+_SEND_QUEUE_MAXSIZE = 10_000
+# Concurrent Bot API calls across all chats
+_SEND_CONCURRENCY = 8
+# Notifications to one chat within this window are merged into one message
+_COALESCE_WINDOW = 0.5
+_DIGEST_SEPARATOR = "\n\n---\n\n"
+# Telegram's maximum message length
+_MAX_MESSAGE_LENGTH = 4096
+# Per-chat rate limiters kept (least recently used chats are dropped)
+_MAX_CHAT_LIMITERS = 1024
+# Retries for a send rejected with RetryAfter (HTTP 429)
+_SEND_MAX_RETRIES = 3
+# Generated drafts kept for re-drafts of the same email and instruction
+_DRAFT_CACHE_SIZE = 256
+_DRAFT_CACHE_TTL = 15 * 60
+
+# Legacy "prefix - instruction" message formats, tried in order in one regex
+_PREFIXED_MESSAGE_RE = re.compile(
+    r'^(?:'
+    r'[Rr]e:\s*(?P<re_ref>.*?\S)\s*[-–—]\s*(?P<re_instr>.+)'
+    r'|[Ff]rom\s+(?P<from_ref>[^\s-]+(?:@[^\s-]+)?)\s*[-–—]\s*(?P<from_instr>.+)'
+    r'|[Ll]atest\s+from\s+(?P<latest_ref>[^\s-]+(?:@[^\s-]+)?)\s*[-–—]\s*(?P<latest_instr>.+)'
+    r')$'
+)
+# instruction group -> (reference group, search type)
+_PREFIXED_MESSAGE_GROUPS = {
+    're_instr': ('re_ref', 'subject'),
+    'from_instr': ('from_ref', 'sender'),
+    'latest_instr': ('latest_ref', 'sender'),
+}
+# Lowercased starts of the prefixed formats, checked before the regex
+_PREFIXED_MESSAGE_HEADS = ('re:', 'from', 'latest')
+# Generic "[subject/keyword] - [instruction]" format. References end on a
+# non-space so the whitespace before the dash is only scanned once; with
+# '.+?' every character of a long blank run re-scanned the rest of it
+_GENERIC_MESSAGE_RE = re.compile(r'^(.*?\S)\s*[-–—]\s*(.+)$')
+
+# Collapse line breaks in single-line previews
+_NEWLINE_TRANS = str.maketrans({'\n': ' ', '\r': ' '})
+
+_HELP_TEXT = (
+    "MCP Email Processor - Mode 4\n\n"
+    "Send me a message in this format:\n"
+    "  Re: [subject] - [instruction]\n"
+    "  From [sender] - [instruction]\n\n"
+    "Examples:\n"
+    "  Re: W9 Request - send W9 and wiring\n"
+    "  From john@example.com - confirm payment\n\n"
+    "Commands:\n"
+    "  /status - Check system status\n"
+    "  /help - Show this message\n"
+    "  /retry - Retry last failed email"
+)
+
+_PARSE_FAILED_TEXT = (
+    "Could not parse your message.\n\n"
+    "Try format: Re: [subject] - [instruction]\n"
+    "Example: Re: W9 Request - send W9 and wiring"
+)
+
+# Notification layouts (only argument substitution happens per call)
+_ROUTE_STATUS = {
+    'ollama_only': "AI generated",
+    'ollama_with_review': "Needs review",
+}
+
+# Plain text; the Gmail link is sent as an inline URL button
+_DRAFT_NOTIFICATION_TEMPLATE = (
+    "Draft Created\n\n"
+    "Re: {subject}\n"
+    "Confidence: {confidence}%\n"
+    "Status: {status}"
+)
+
+_ERROR_NOTIFICATION_TEMPLATE = (
+    "Error Processing Email\n\n"
+    "Reference: {reference}\n"
+    "Error: {error}"
+)
+
+_ESCALATION_NOTIFICATION_TEMPLATE = (
+    "Escalated to Claude Desktop\n\n"
+    "Re: {subject}\n"
+    "Confidence: {confidence}%\n"
+    "Reason: {reason}\n\n"
+    "Handle via Claude Desktop when at work laptop."
+)
+
+_DRAFT_REQUEST_TEMPLATE = (
+    "<b>Email Found</b>\n\n"
+    "<b>From:</b> {sender}\n"
+    "<b>Subject:</b> {subject}\n"
+    "<b>Preview:</b> {body_preview}...\n\n"
+    "<b>Your instruction:</b> {instruction}\n\n"
+    "<b>Recommendation:</b> {recommendation}\n\n"
+    "Choose LLM for drafting:"
+)
+
+
 class TelegramHandlerError(Exception):
     """Custom exception for Telegram handler errors."""
     pass
 
 
+@dataclass(slots=True)
+class DraftContext:
+    """Pending draft session tracked for inline button callbacks."""
+    user_id: int
+    chat_id: int
+    email_data: Dict[str, Any]
+    instruction: str
+    pattern_match: Optional[Dict[str, Any]]
+    recommendation: str
+    timestamp: float
+    expiry: float
+    draft_text: Optional[str] = None
+    model_used: Optional[str] = None
+    confidence: int = 0
+    original_draft: Optional[str] = None
+    changes_made: List[str] = field(default_factory=list)
+
+    @property
+    def template(self) -> Optional[Any]:
+        """Reply template from the pattern match, if any."""
+        pattern_match = self.pattern_match
+        return pattern_match.get('template') if pattern_match else None
+
+
+class _AsyncRateLimiter:
+    """
+    Leaky-bucket limiter allowing max_rate acquisitions per time_period.
+
+    Waiters are served in FIFO order, so messages queued for the same chat
+    keep their order.
+    """
+
+    __slots__ = ('max_rate', 'time_period', '_rate_per_sec', '_level', '_last_check', '_lock')
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate_per_sec = max_rate / time_period
+        self._level = 0.0
+        self._last_check = 0.0
+        self._lock = asyncio.Lock()
+
+    def _leak(self):
+        now = time.monotonic()
+        if self._level:
+            elapsed = now - self._last_check
+            self._level = max(0.0, self._level - elapsed * self._rate_per_sec)
+        self._last_check = now
+
+    async def _wait_for_capacity(self):
+        while True:
+            self._leak()
+            if self._level + 1 <= self.max_rate:
+                self._level += 1
+                return
+            await asyncio.sleep((self._level + 1 - self.max_rate) / self._rate_per_sec)
+
+    async def acquire(self):
+        async with self._lock:
+            await self._wait_for_capacity()
+
+
 class TelegramHandler:
     """
     Telegram bot handler for Mode 4.
@@ -49,11 +362,37 @@ class TelegramHandler:
     and instructions, and sends responses back.
     """
 
+    # Fixed attribute layout (no per-instance __dict__)
+    __slots__ = (
+        'processor', 'bot_token', 'allowed_users', 'admin_chat_id', '_allowed_users_set',
+        '_authorized_chats',
+        'base_url', 'base_file_url',
+        '_request', 'bot', 'application', '_stop_event', 'message_callback',
+        '_draft_contexts', '_expiry_heap', '_context_expiry_seconds', '_max_draft_contexts',
+        '_draft_id_prefix', '_draft_counter',
+        '_send_lanes', '_send_workers', '_send_credit', '_send_slots', '_send_loop',
+        '_global_limiter', '_per_chat_rate', '_chat_limiters',
+        '_pending_notifications', '_flush_tasks', '_chat_locks',
+        '_conversation_manager', '_clients', '_gmail_lock', '_draft_cache', '_inflight_drafts',
+    )
+
+    # Inline button labels (layout is fixed, only callback_data varies per draft)
+    _BTN_OLLAMA_TEXT = "⚡ Ollama (Fast)"
+    _BTN_KIMI_TEXT = "🚀 Kimi K2 (Smart)"
+    _BTN_CLAUDE_TEXT = "🧠 Claude (Smart)"
+    _BTN_APPROVE_TEXT = "✅ Approve"
+    _BTN_REFINE_KIMI_TEXT = "🔄 Refine w/ Kimi"
+    _BTN_REFINE_CLAUDE_TEXT = "🔄 Refine w/ Claude"
+    _BTN_CANCEL_TEXT = "❌ Cancel"
+    _BTN_OPEN_DRAFT_TEXT = "Open Draft in Gmail"
+
     def __init__(
         self,
         bot_token: str = None,
         allowed_users: List[int] = None,
-        admin_chat_id: int = None
+        admin_chat_id: int = None,
+        base_url: str = None,
+        base_file_url: str = None
     ):
         """
         Initialize Telegram handler.
@@ -62,12 +401,16 @@ class TelegramHandler:
             bot_token: Telegram bot token from @BotFather
             allowed_users: List of allowed Telegram user IDs
             admin_chat_id: Admin chat ID for notifications
+            base_url: Bot API base URL, e.g. a local server started with
+                      `telegram-bot-api --local` (http://127.0.0.1:8081/bot)
+            base_file_url: Bot API file base URL for the same server
         """
         if not TELEGRAM_AVAILABLE:
             raise TelegramHandlerError(
                 "Telegram package not installed. Run:\n"
                 "pip install python-telegram-bot[job-queue]"
             )
+        _import_telegram()
 
         # Added to prevent crashes when linked by mode4_processor.py
         self.processor = None
@@ -79,10 +422,40 @@ class TelegramHandler:
             self.bot_token = bot_token or config.get('bot_token')
             self.allowed_users = allowed_users or config.get('allowed_users', [])
             self.admin_chat_id = admin_chat_id or config.get('admin_chat_id')
+            self.base_url = base_url or config.get('base_url')
+            self.base_file_url = base_file_url or config.get('base_file_url')
         except ImportError:
             self.bot_token = bot_token
             self.allowed_users = allowed_users or []
             self.admin_chat_id = admin_chat_id
+            self.base_url = base_url
+            self.base_file_url = base_file_url
+
+        # Set view for O(1) membership checks on every update; ids from
+        # telegram_config.json may be strings, Telegram's are always ints
+        allowed_ids = set()
+        for user_id in self.allowed_users or ():
+            try:
+                allowed_ids.add(int(user_id))
+            except (TypeError, ValueError):
+                logger.warning("Ignoring non-numeric allowed_users entry %r", user_id)
+        if self.allowed_users and not allowed_ids:
+            # An empty set allows everyone; never fall back to that silently
+            raise TelegramHandlerError(
+                f"No valid user IDs in allowed_users {self.allowed_users!r}; "
+                "use numeric Telegram user IDs, not @usernames"
+            )
+        self._allowed_users_set = frozenset(allowed_ids)
+        # admin_chat_id comes from the same file
+        if self.admin_chat_id is not None:
+            try:
+                self.admin_chat_id = int(self.admin_chat_id)
+            except (TypeError, ValueError):
+                logger.warning("Ignoring non-numeric admin_chat_id %r", self.admin_chat_id)
+                self.admin_chat_id = None
+        # Chats (e.g. groups) an allowed user has messaged the bot from; they
+        # may receive notifications although their ids are not user ids
+        self._authorized_chats: Set[int] = set()
 
         if not self.bot_token or self.bot_token == "YOUR_BOT_TOKEN_HERE":
             raise TelegramHandlerError(
@@ -92,14 +465,29 @@ class TelegramHandler:
                 "3. Copy the token and add it to m1_config.py"
             )
 
-        self.bot = Bot(token=self.bot_token)
+        # One pooled transport shared by this Bot and, after setup_bot, the
+        # Application's bot
+        self._request = _make_request(_CONNECTION_POOL_SIZE, read_timeout=20.0)
+        bot_kwargs = {}
+        if self.base_url:
+            bot_kwargs['base_url'] = self.base_url
+        if self.base_file_url:
+            bot_kwargs['base_file_url'] = self.base_file_url
+        self.bot = Bot(token=self.bot_token, request=self._request, **bot_kwargs)
         self.application = None
+        self._stop_event: Optional[asyncio.Event] = None
         self.message_callback: Optional[Callable] = None
 
         # Draft context storage for inline button callbacks
-        # {draft_id: {context_data, timestamp, user_id, chat_id}}
-        self._draft_contexts: Dict[str, Dict[str, Any]] = {}
-        self._context_expiry_minutes = 30
+        # {draft_id: DraftContext}, kept in LRU order
+        self._draft_contexts: 'OrderedDict[str, DraftContext]' = OrderedDict()
+        # Min-heap of (expiry, draft_id) on the monotonic clock for O(log n) expiry
+        self._expiry_heap: List[tuple] = []
+        # Draft IDs are a random per-process prefix plus a counter, so buttons
+        # left over from a previous run never match a new draft
+        self._draft_id_prefix = os.urandom(3).hex()
+        self._draft_counter = itertools.count(1)
+        self._context_expiry_seconds = 30 * 60
         self._max_draft_contexts = 100  # Prevent unbounded memory growth
         try:
             from m1_config import MAX_DRAFT_CONTEXTS
@@ -107,9 +495,43 @@ class TelegramHandler:
         except (ImportError, AttributeError):
             pass
 
+        # Outbound send queues, one per chat, each drained in order by its own
+        # worker task on the running event loop (created lazily on first send)
+        self._send_lanes: Dict[int, deque] = {}
+        self._send_workers: Set[asyncio.Task] = set()
+        self._send_credit: Optional[asyncio.Semaphore] = None
+        self._send_slots: Optional[asyncio.Semaphore] = None
+        self._send_loop = None
+        global_rate, per_chat_rate = 28, 1
+        try:
+            from m1_config import TELEGRAM_GLOBAL_MSGS_PER_SECOND, TELEGRAM_PER_CHAT_MSGS_PER_SECOND
+            global_rate = TELEGRAM_GLOBAL_MSGS_PER_SECOND
+            per_chat_rate = TELEGRAM_PER_CHAT_MSGS_PER_SECOND
+        except (ImportError, AttributeError):
+            pass
+        self._global_limiter = _AsyncRateLimiter(global_rate, 1.0)
+        self._per_chat_rate = per_chat_rate
+        self._chat_limiters: 'OrderedDict[int, _AsyncRateLimiter]' = OrderedDict()
+
+        # Notifications held per chat for coalescing into digest messages
+        self._pending_notifications: Dict[int, List[tuple]] = {}
+        self._flush_tasks: Dict[int, asyncio.Task] = {}
+
+        # Per-chat handler locks; entries vanish once no handler holds them
+        self._chat_locks: 'weakref.WeakValueDictionary[int, asyncio.Lock]' = weakref.WeakValueDictionary()
+
         # Conversation manager for natural language interface (lazy loaded)
         self._conversation_manager = None
 
+        # LLM clients shared across drafts (see _get_client)
+        self._clients: Dict[str, Any] = {}
+        self._gmail_lock = asyncio.Lock()
+
+        # Recent LLM draft results: key -> (expiry, result), LRU ordered
+        self._draft_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        # Draft generations in progress, keyed like _draft_cache (single-flight)
+        self._inflight_drafts: Dict[tuple, asyncio.Future] = {}
+
     @property
     def conversation_manager(self):
         """Lazy-load conversation manager."""
@@ -123,7 +545,7 @@ class TelegramHandler:
                 )
                 logger.info("Conversation manager initialized")
             except ImportError as e:
-                logger.warning(f"Could not load conversation manager: {e}")
+                logger.warning("Could not load conversation manager: %s", e)
                 self._conversation_manager = None
         return self._conversation_manager
 
@@ -148,6 +570,124 @@ class TelegramHandler:
         """Escape HTML special characters to prevent Telegram parsing errors."""
         return html.escape(str(text)) if text else ''
 
+    # ==================
+    # OUTBOUND QUEUE
+    # ==================
+
+    def _bind_send_loop(self) -> asyncio.AbstractEventLoop:
+        """Set up the send queues on the running loop if they are not already there."""
+        loop = asyncio.get_running_loop()
+        if self._send_loop is not loop:
+            # First send, or the bot moved to a new event loop (e.g. startup
+            # queue processing runs before polling starts)
+            self._send_loop = loop
+            self._send_lanes = {}
+            self._send_workers = set()
+            self._send_credit = asyncio.Semaphore(_SEND_QUEUE_MAXSIZE)
+            self._send_slots = asyncio.Semaphore(_SEND_CONCURRENCY)
+            # The limiters' locks belong to the old loop as well
+            limiter = self._global_limiter
+            self._global_limiter = _AsyncRateLimiter(limiter.max_rate, limiter.time_period)
+            self._chat_limiters.clear()
+        return loop
+
+    def _chat_limiter(self, chat_id: int) -> _AsyncRateLimiter:
+        """Return the chat's rate limiter; only recently active chats keep one."""
+        limiters = self._chat_limiters
+        limiter = limiters.get(chat_id)
+        if limiter is None:
+            limiter = limiters[chat_id] = _AsyncRateLimiter(self._per_chat_rate, 1.0)
+            if len(limiters) > _MAX_CHAT_LIMITERS:
+                # Idle the longest; its bucket has long since drained
+                limiters.popitem(last=False)
+        else:
+            limiters.move_to_end(chat_id)
+        return limiter
+
+    async def _submit_send(self, method: str = 'send_message', /, **kwargs) -> asyncio.Future:
+        """
+        Queue a Bot API call (send_message unless another Bot method name is
+        given), waiting for backlog space if needed.
+
+        Calls are queued per chat, so a chat held back by its rate limit
+        never delays the others. The backlog cap acts as the send credit:
+        when it is spent, handlers block here, which pushes back on update
+        processing instead of growing memory.
+        """
+        loop = self._bind_send_loop()
+        await self._send_credit.acquire()
+        future = loop.create_future()
+        chat_id = kwargs.get('chat_id')
+        lane = self._send_lanes.get(chat_id)
+        if lane is None:
+            lane = self._send_lanes[chat_id] = deque()
+            worker = loop.create_task(self._send_worker(chat_id, lane))
+            self._send_workers.add(worker)
+            worker.add_done_callback(self._send_workers.discard)
+        lane.append((method, kwargs, future))
+        return future
+
+    async def _send_worker(self, chat_id: int, lane: deque):
+        """Deliver one chat's queued calls in order, then exit."""
+        credit = self._send_credit
+        try:
+            while lane:
+                await self._deliver(*lane[0])
+                lane.popleft()
+                credit.release()
+        finally:
+            if self._send_lanes.get(chat_id) is lane:
+                del self._send_lanes[chat_id]
+            # Cancelled: fail what is left rather than leave callers waiting
+            while lane:
+                future = lane.popleft()[2]
+                if not future.done():
+                    future.set_exception(TelegramHandlerError(f"Send to chat {chat_id} cancelled"))
+                credit.release()
+
+    @staticmethod
+    def _log_send_failure(future: asyncio.Future):
+        """Done-callback for sends nobody awaits: log (and consume) errors."""
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Background send failed: %s", future.exception())
+
+    async def _deliver(self, method: str, kwargs: Dict[str, Any], future: asyncio.Future):
+        """
+        Make one Bot API call within the per-chat and global rate limits,
+        honoring flood waits. The future is resolved on every path.
+        """
+        chat_id = kwargs.get('chat_id')
+        try:
+            call = getattr(self.bot, method)
+            limiter = self._chat_limiter(chat_id)
+            for attempt in range(_SEND_MAX_RETRIES + 1):
+                # Per-chat token first: a global token taken earlier would be
+                # spent while this chat still waits for its own
+                await limiter.acquire()
+                await self._global_limiter.acquire()
+                try:
+                    async with self._send_slots:
+                        result = await call(**kwargs)
+                    break
+                except RetryAfter as e:
+                    if attempt == _SEND_MAX_RETRIES:
+                        raise
+                    delay = e.retry_after
+                    if hasattr(delay, 'total_seconds'):
+                        delay = delay.total_seconds()
+                    logger.warning("Flood limit hit for chat %s, retrying in %ss", chat_id, delay)
+                    await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if not future.done():
+                future.set_exception(TelegramHandlerError(f"Send to chat {chat_id} cancelled"))
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
     # ==================
     # MESSAGE PARSING
     # ==================
@@ -159,11 +699,11 @@ class TelegramHandler:
         """
         text = text.strip()
 
-        # Use SmartParser if enabled and linked
-        from m1_config import SMART_PARSER_ENABLED
-        if SMART_PARSER_ENABLED and self.processor and hasattr(self.processor, 'smart_parser'):
+        # Use SmartParser if enabled and linked (one lookup; processor may be None)
+        smart_parser = getattr(self.processor, 'smart_parser', None) if SMART_PARSER_ENABLED else None
+        if smart_parser is not None:
             try:
-                parsed = self.processor.smart_parser.parse_with_fallback(text)
+                parsed = smart_parser.parse_with_fallback(text)
                 return {
                     'email_reference': parsed.get('email_reference', ''),
                     'instruction': parsed.get('instruction', ''),
@@ -173,76 +713,79 @@ class TelegramHandler:
                     'parsed_with': parsed.get('parsed_with', 'llm')
                 }
             except Exception as e:
-                logger.warning(f"SmartParser failed: {e}, falling back to legacy patterns")
-
-        # Legacy regex parsing (backward compatibility)
-        result = {
-            'email_reference': '',
-            'instruction': '',
-            'search_type': 'keyword',
-            'raw_text': text,
-            'valid': False
-        }
-
-        # Pattern 1: "Re: [subject] - [instruction]"
-        match = re.match(r'^[Rr]e:\s*(.+?)\s*[-–—]\s*(.+)$', text)
-        if match:
-            result['email_reference'] = match.group(1).strip()
-            result['instruction'] = match.group(2).strip()
-            result['search_type'] = 'subject'
-            result['valid'] = True
-            return result
-
-        # Pattern 2: "From [sender] - [instruction]"
-        match = re.match(r'^[Ff]rom\s+([^\s-]+(?:@[^\s-]+)?)\s*[-–—]\s*(.+)$', text)
-        if match:
-            result['email_reference'] = match.group(1).strip()
-            result['instruction'] = match.group(2).strip()
-            result['search_type'] = 'sender'
-            result['valid'] = True
-            return result
-
-        # Pattern 3: "latest from [sender] - [instruction]"
-        match = re.match(r'^[Ll]atest\s+from\s+([^\s-]+(?:@[^\s-]+)?)\s*[-–—]\s*(.+)$', text)
+                logger.warning("SmartParser failed: %s, falling back to legacy patterns", e)
+
+        # Legacy regex parsing (backward compatibility). Each branch builds
+        # its result dict in one literal rather than patching a default one
+
+        # Patterns 1-3: "Re: [subject] - ...", "From [sender] - ...",
+        # "latest from [sender] - ..." in one scan; the alternative that
+        # matched is identified by its instruction group. Most messages have
+        # none of these prefixes, so check the prefix before running the regex
+        match = None
+        if text[:6].lower().startswith(_PREFIXED_MESSAGE_HEADS):
+            match = _PREFIXED_MESSAGE_RE.match(text)
         if match:
-            result['email_reference'] = match.group(1).strip()
-            result['instruction'] = match.group(2).strip()
-            result['search_type'] = 'sender'
-            result['valid'] = True
-            return result
+            instruction_group = match.lastgroup
+            ref_group, search_type = _PREFIXED_MESSAGE_GROUPS[instruction_group]
+            return {
+                'email_reference': match.group(ref_group).strip(),
+                'instruction': match.group(instruction_group).strip(),
+                'search_type': search_type,
+                'raw_text': text,
+                'valid': True
+            }
 
         # Pattern 4: "[subject/keyword] - [instruction]" (generic)
-        match = re.match(r'^(.+?)\s*[-–—]\s*(.+)$', text)
+        # Fast path: plain " - " that is the first dash on a single line splits
+        # exactly where the regex would, so skip the regex for it
+        ref, sep, instruction = text.partition(' - ')
+        if sep and '\n' not in text and not ('-' in ref or '–' in ref or '—' in ref):
+            match = True
+            ref = ref.strip()
+            instruction = instruction.strip()
+        else:
+            match = _GENERIC_MESSAGE_RE.match(text)
+            if match:
+                ref = match.group(1).strip()
+                instruction = match.group(2).strip()
         if match:
-            ref = match.group(1).strip()
-            instruction = match.group(2).strip()
-
-            # Determine search type based on reference
-            if '@' in ref:
-                result['search_type'] = 'sender'
-            else:
-                result['search_type'] = 'keyword'
-
-            result['email_reference'] = ref
-            result['instruction'] = instruction
-            result['valid'] = True
-            return result
+            return {
+                'email_reference': ref,
+                'instruction': instruction,
+                # Determine search type based on reference
+                'search_type': 'sender' if '@' in ref else 'keyword',
+                'raw_text': text,
+                'valid': True
+            }
 
         # Pattern 5: Commands starting with /
         if text.startswith('/'):
-            parts = text.split(maxsplit=1)
-            result['command'] = parts[0].lower()
-            result['args'] = parts[1] if len(parts) > 1 else ''
-            result['valid'] = True
-            return result
+            # Slice at the first space instead of building a split() list;
+            # fall back to split() when a newline or tab ends the command
+            command, _, args = text.partition(' ')
+            if not command.isprintable():
+                parts = text.split(maxsplit=1)
+                command, args = parts[0], parts[1] if len(parts) > 1 else ''
+            return {
+                'email_reference': '',
+                'instruction': '',
+                'search_type': 'keyword',
+                'raw_text': text,
+                'valid': True,
+                # Commands are almost always typed lowercase; skip the copy then
+                'command': command if command.islower() else command.lower(),
+                'args': args.lstrip()
+            }
 
         # Could not parse - might be a simple keyword search
-        result['email_reference'] = text
-        result['instruction'] = 'respond appropriately'
-        result['search_type'] = 'keyword'
-        result['valid'] = bool(text)
-
-        return result
+        return {
+            'email_reference': text,
+            'instruction': 'respond appropriately',
+            'search_type': 'keyword',
+            'raw_text': text,
+            'valid': bool(text)
+        }
 
     # ==================
     # BOT SETUP
@@ -258,25 +801,69 @@ class TelegramHandler:
         """
         self.message_callback = message_callback
 
-        self.application = Application.builder().token(self.bot_token).build()
+        # The Application (and its warmed HTTP connections) is built once and
+        # reused across stop_async()/run_async() restarts
+        if self.application is None:
+            self._build_app_once()
+            self._wire_handlers()
+
+    def _build_app_once(self):
+        """Build the Application; callers check self.application first."""
+        builder = (
+            Application.builder()
+            .token(self.bot_token)
+            .request(self._request)
+            .get_updates_request(_make_request(1, read_timeout=_POLL_TIMEOUT + 5))
+            .concurrent_updates(True)
+        )
+        if self.base_url:
+            builder = builder.base_url(self.base_url)
+        if self.base_file_url:
+            builder = builder.base_file_url(self.base_file_url)
+        self.application = builder.build()
+        # Share the application's bot (and its HTTP connection pool) for all
+        # outbound calls; the standalone Bot is only used before setup
+        self.bot = self.application.bot
+
+    def _wire_handlers(self):
+        """Register command, message and callback handlers on the Application."""
+        # Updates are processed concurrently across chats; each callback is
+        # serialized per chat so a single conversation stays in order
+        serial = self._serialize_per_chat
 
         # Add handlers
-        self.application.add_handler(CommandHandler("start", self._cmd_start))
-        self.application.add_handler(CommandHandler("help", self._cmd_help))
-        self.application.add_handler(CommandHandler("status", self._cmd_status))
-        self.application.add_handler(CommandHandler("retry", self._cmd_retry))
+        self.application.add_handler(CommandHandler("start", serial(self._cmd_start), block=False))
+        self.application.add_handler(CommandHandler("help", serial(self._cmd_help), block=False))
+        self.application.add_handler(CommandHandler("status", serial(self._cmd_status), block=False))
+        self.application.add_handler(CommandHandler("retry", serial(self._cmd_retry), block=False))
 
         # Message handler for processing emails
         self.application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message)
+            MessageHandler(filters.TEXT & ~filters.COMMAND, serial(self._handle_message), block=False)
         )
 
         # Callback query handler for inline buttons
-        self.application.add_handler(CallbackQueryHandler(self._handle_callback_query))
+        self.application.add_handler(
+            CallbackQueryHandler(serial(self._handle_callback_query), block=False)
+        )
 
         # Error handler
         self.application.add_error_handler(self._error_handler)
 
+    def _serialize_per_chat(self, callback: Callable) -> Callable:
+        """Wrap a handler so updates from the same chat run one at a time."""
+        @functools.wraps(callback)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            chat = update.effective_chat if update else None
+            if chat is None:
+                return await callback(update, context)
+            lock = self._chat_locks.get(chat.id)
+            if lock is None:
+                lock = self._chat_locks[chat.id] = asyncio.Lock()
+            async with lock:
+                return await callback(update, context)
+        return wrapper
+
     async def _cmd_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command."""
         user = update.effective_user
@@ -286,26 +873,23 @@ class TelegramHandler:
             await update.message.reply_text(
                 "Unauthorized. Your user ID is not in the allowed list."
             )
-            logger.warning(f"Unauthorized access attempt from user {user.id}")
+            logger.warning("Unauthorized access attempt from user %s", user.id)
             return
 
-        await update.message.reply_text(
-            "MCP Email Processor - Mode 4\n\n"
-            "Send me a message in this format:\n"
-            "  Re: [subject] - [instruction]\n"
-            "  From [sender] - [instruction]\n\n"
-            "Examples:\n"
-            "  Re: W9 Request - send W9 and wiring\n"
-            "  From john@example.com - confirm payment\n\n"
-            "Commands:\n"
-            "  /status - Check system status\n"
-            "  /help - Show this message\n"
-            "  /retry - Retry last failed email"
-        )
+        await update.message.reply_text(_HELP_TEXT)
 
     async def _cmd_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command."""
-        await self._cmd_start(update, context)
+        user = update.effective_user
+
+        if not self._is_authorized(user.id):
+            await update.message.reply_text(
+                "Unauthorized. Your user ID is not in the allowed list."
+            )
+            logger.warning("Unauthorized access attempt from user %s", user.id)
+            return
+
+        await update.message.reply_text(_HELP_TEXT)
 
     async def _cmd_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command."""
@@ -320,9 +904,8 @@ class TelegramHandler:
 
         # Check Ollama
         try:
-            from ollama_client import OllamaClient
-            ollama = OllamaClient()
-            if ollama.is_available():
+            ollama = self._get_client('ollama')
+            if await asyncio.to_thread(ollama.is_available):
                 status_lines.append("  Ollama: OK")
             else:
                 status_lines.append("  Ollama: Model not available")
@@ -331,11 +914,8 @@ class TelegramHandler:
 
         # Check Gmail
         try:
-            from gmail_client import GmailClient
-            gmail = GmailClient()
+            self._get_client('gmail')
             # Don't authenticate, just check if credentials exist
-            import os
-            from m1_config import GMAIL_TOKEN_PATH
             if os.path.exists(GMAIL_TOKEN_PATH):
                 status_lines.append("  Gmail: Configured")
             else:
@@ -364,14 +944,14 @@ class TelegramHandler:
         chat_id = update.effective_chat.id
         text = update.message.text
 
-        if not self._is_authorized(user.id):
+        if not self._is_authorized(user.id, chat_id):
             await update.message.reply_text(
                 f"Unauthorized. Your user ID ({user.id}) is not in the allowed list."
             )
-            logger.warning(f"Unauthorized message from user {user.id}: {text[:50]}")
+            logger.warning("Unauthorized message from user %s: %.50s", user.id, text)
             return
 
-        logger.info(f"Message from {user.id}: {text[:100]}")
+        logger.info("Message from %s: %.100s", user.id, text)
 
         # Show typing bubble so user knows bot is working
         await self.send_typing(chat_id)
@@ -381,7 +961,7 @@ class TelegramHandler:
             try:
                 result = await self.conversation_manager.handle_message(text, user.id, chat_id)
                 if result.get('handled'):
-                    logger.info(f"Message handled by conversation manager: {result.get('routed_to')}")
+                    logger.info("Message handled by conversation manager: %s", result.get('routed_to'))
                     return
                 # If not handled but has parsed_message, use it
                 if result.get('parsed_message'):
@@ -390,17 +970,13 @@ class TelegramHandler:
                         await self.message_callback(parsed, chat_id, user.id)
                     return
             except Exception as e:
-                logger.warning(f"Conversation manager error: {e}, falling back to parse_message")
+                logger.warning("Conversation manager error: %s, falling back to parse_message", e)
 
         # Parse the message using legacy parser
         parsed = self.parse_message(text)
 
         if not parsed.get('valid'):
-            await update.message.reply_text(
-                "Could not parse your message.\n\n"
-                "Try format: Re: [subject] - [instruction]\n"
-                "Example: Re: W9 Request - send W9 and wiring"
-            )
+            await update.message.reply_text(_PARSE_FAILED_TEXT)
             return
 
         # If callback is set, call it
@@ -408,7 +984,7 @@ class TelegramHandler:
             try:
                 await self.message_callback(parsed, chat_id, user.id)
             except Exception as e:
-                logger.error(f"Callback error: {e}")
+                logger.error("Callback error: %s", e)
                 await update.message.reply_text(
                     f"Error processing request: {str(e)[:200]}"
                 )
@@ -424,7 +1000,7 @@ class TelegramHandler:
 
     async def _error_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle errors."""
-        logger.error(f"Update {update} caused error {context.error}")
+        logger.error("Update %s caused error %s", update, context.error)
 
         if update and update.effective_chat:
             await context.bot.send_message(
@@ -432,22 +1008,44 @@ class TelegramHandler:
                 text=f"An error occurred: {str(context.error)[:200]}"
             )
 
-    def _is_authorized(self, user_id: int) -> bool:
-        """Check if user is authorized."""
-        if not self.allowed_users:
+    def _is_authorized(self, user_id: int, chat_id: Optional[int] = None) -> bool:
+        """
+        Check if user is authorized.
+
+        If chat_id is given and the user is authorized, the chat is
+        remembered as one that may receive notifications.
+        """
+        allowed = self._allowed_users_set
+        if not allowed:
             # If no allowed users configured, allow all (for testing)
             logger.warning("No allowed_users configured - allowing all users")
             return True
-        return user_id in self.allowed_users
+        if user_id not in allowed:
+            return False
+        if chat_id is not None:
+            self._authorized_chats.add(chat_id)
+        return True
 
     # ==================
     # INLINE BUTTON HANDLING
     # ==================
 
+    def _get_client(self, name: str):
+        """Return the shared 'ollama', 'kimi', 'claude' or 'gmail' client, creating it on first use."""
+        client = self._clients.get(name)
+        if client is None:
+            cls = {
+                'ollama': OllamaClient, 'kimi': KimiClient,
+                'claude': ClaudeClient, 'gmail': GmailClient,
+            }[name]
+            if cls is None:
+                raise ImportError(f"{name}_client is not available")
+            client = self._clients[name] = cls()
+        return client
+
     def _generate_draft_id(self) -> str:
         """Generate a unique draft ID for context tracking."""
-        import uuid
-        return str(uuid.uuid4())[:8]
+        return f"{self._draft_id_prefix}{next(self._draft_counter):x}"
 
     def _store_draft_context(
         self,
@@ -460,51 +1058,102 @@ class TelegramHandler:
         recommendation: str = ""
     ):
         """Store draft context for callback handling."""
-        import time
-        self._draft_contexts[draft_id] = {
-            'user_id': user_id,
-            'chat_id': chat_id,
-            'email_data': email_data,
-            'instruction': instruction,
-            'pattern_match': pattern_match,
-            'recommendation': recommendation,
-            'timestamp': time.time(),
-            'draft_text': None,
-            'model_used': None
-        }
-        # Cleanup old contexts
-        self._cleanup_expired_contexts()
+        now = time.monotonic()
+        expiry = now + self._context_expiry_seconds
+        self._draft_contexts[draft_id] = DraftContext(
+            user_id=user_id,
+            chat_id=chat_id,
+            email_data=email_data,
+            instruction=instruction,
+            pattern_match=pattern_match,
+            recommendation=recommendation,
+            timestamp=now,
+            expiry=expiry
+        )
+        self._draft_contexts.move_to_end(draft_id)
+        heapq.heappush(self._expiry_heap, (expiry, draft_id))
+        # Cleanup old contexts; only peeks at the heap unless something expired
+        self._cleanup_expired_contexts(now)
 
-        # Evict oldest if still over limit
+        # Evict least recently used if still over limit
         while len(self._draft_contexts) > self._max_draft_contexts:
-            oldest_id = min(
-                self._draft_contexts,
-                key=lambda did: self._draft_contexts[did].get('timestamp', 0)
+            oldest_id, _ = self._draft_contexts.popitem(last=False)
+            logger.warning(
+                "Draft context limit (%d) reached, evicted least recently used: %s",
+                self._max_draft_contexts, oldest_id
             )
-            del self._draft_contexts[oldest_id]
-            logger.debug(f"Evicted oldest draft context: {oldest_id}")
 
-    def _get_draft_context(self, draft_id: str) -> Optional[Dict[str, Any]]:
-        """Get draft context by ID."""
-        return self._draft_contexts.get(draft_id)
+    def _get_draft_context(self, draft_id: str) -> Optional[DraftContext]:
+        """Get draft context by ID (refreshes its LRU position); None once expired."""
+        ctx = self._draft_contexts.get(draft_id)
+        if ctx is None:
+            return None
+        if ctx.expiry < time.monotonic():
+            # Stores sweep the expiry heap; a lookup may run into one first
+            del self._draft_contexts[draft_id]
+            return None
+        self._draft_contexts.move_to_end(draft_id)
+        return ctx
 
     def _update_draft_context(self, draft_id: str, updates: Dict[str, Any]):
         """Update an existing draft context."""
-        if draft_id in self._draft_contexts:
-            self._draft_contexts[draft_id].update(updates)
+        ctx = self._draft_contexts.get(draft_id)
+        if ctx is not None:
+            for name, value in updates.items():
+                setattr(ctx, name, value)
 
-    def _cleanup_expired_contexts(self):
+    def _cleanup_expired_contexts(self, now: Optional[float] = None):
         """Remove expired draft contexts."""
-        import time
-        current_time = time.time()
-        expiry_seconds = self._context_expiry_minutes * 60
-
-        expired = [
-            draft_id for draft_id, ctx in self._draft_contexts.items()
-            if current_time - ctx['timestamp'] > expiry_seconds
-        ]
-        for draft_id in expired:
-            del self._draft_contexts[draft_id]
+        if now is None:
+            now = time.monotonic()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expiry, draft_id = heapq.heappop(heap)
+            ctx = self._draft_contexts.get(draft_id)
+            # Skip stale heap entries for contexts already removed or re-stored
+            if ctx is not None and ctx.expiry == expiry:
+                del self._draft_contexts[draft_id]
+
+    def _build_draft_keyboard(self, draft_id: str) -> 'InlineKeyboardMarkup':
+        """Build the LLM selection keyboard for a draft request."""
+        return InlineKeyboardMarkup([
+            [InlineKeyboardButton(self._BTN_OLLAMA_TEXT, callback_data=f"draft:ollama:{draft_id}")],
+            [
+                InlineKeyboardButton(self._BTN_KIMI_TEXT, callback_data=f"draft:kimi:{draft_id}"),
+                InlineKeyboardButton(self._BTN_CLAUDE_TEXT, callback_data=f"draft:claude:{draft_id}"),
+            ],
+            [InlineKeyboardButton(self._BTN_CANCEL_TEXT, callback_data=f"draft:cancel:{draft_id}")],
+        ])
+
+    def _build_preview_keyboard(
+        self,
+        draft_id: str,
+        include_escalate: bool = False
+    ) -> 'InlineKeyboardMarkup':
+        """Build the approve/refine/cancel keyboard for a draft preview."""
+        keyboard = [[
+            InlineKeyboardButton(self._BTN_APPROVE_TEXT, callback_data=f"draft:approve:{draft_id}"),
+        ]]
+        if include_escalate:
+            keyboard.append([
+                InlineKeyboardButton(self._BTN_REFINE_KIMI_TEXT, callback_data=f"draft:escalate_kimi:{draft_id}"),
+                InlineKeyboardButton(self._BTN_REFINE_CLAUDE_TEXT, callback_data=f"draft:escalate:{draft_id}"),
+            ])
+        keyboard.append([
+            InlineKeyboardButton(self._BTN_CANCEL_TEXT, callback_data=f"draft:cancel:{draft_id}")
+        ])
+        return InlineKeyboardMarkup(keyboard)
+
+    def _build_open_draft_keyboard(self, draft_urls: List[str]) -> 'InlineKeyboardMarkup':
+        """Build URL buttons linking to Gmail drafts (numbered if more than one)."""
+        if len(draft_urls) == 1:
+            return InlineKeyboardMarkup([
+                [InlineKeyboardButton(self._BTN_OPEN_DRAFT_TEXT, url=draft_urls[0])]
+            ])
+        return InlineKeyboardMarkup([
+            [InlineKeyboardButton(f"Open Draft {i} in Gmail", url=url)]
+            for i, url in enumerate(draft_urls, 1)
+        ])
 
     async def send_draft_request_with_buttons(
         self,
@@ -534,7 +1183,8 @@ class TelegramHandler:
 
         # Get LLM recommendation
         try:
-            from llm_router import route_draft_request
+            if route_draft_request is None:
+                raise ImportError("llm_router is not available")
             routing = route_draft_request(
                 instruction,
                 email_data,
@@ -557,50 +1207,42 @@ class TelegramHandler:
             recommendation=recommendation
         )
 
-        # Build message - escape HTML to prevent parsing errors with email addresses
-        subject = self._escape_html(email_data.get('subject', '(no subject)')[:50])
-        sender = self._escape_html(email_data.get('sender_name', email_data.get('sender_email', 'Unknown')))
-        body_preview = self._escape_html(email_data.get('body', '')[:150].replace('\n', ' '))
-        instruction_escaped = self._escape_html(instruction)
-        recommendation_escaped = self._escape_html(recommendation)
-
-        message = (
-            f"<b>Email Found</b>\n\n"
-            f"<b>From:</b> {sender}\n"
-            f"<b>Subject:</b> {subject}\n"
-            f"<b>Preview:</b> {body_preview}...\n\n"
-            f"<b>Your instruction:</b> {instruction_escaped}\n\n"
-            f"<b>Recommendation:</b> {recommendation_escaped}\n\n"
-            f"Choose LLM for drafting:"
-        )
-
-        # Build keyboard
-        keyboard = [
-            [
-                InlineKeyboardButton("⚡ Ollama (Fast)", callback_data=f"draft:ollama:{draft_id}"),
-            ],
-            [
-                InlineKeyboardButton("🚀 Kimi K2 (Smart)", callback_data=f"draft:kimi:{draft_id}"),
-                InlineKeyboardButton("🧠 Claude (Smart)", callback_data=f"draft:claude:{draft_id}")
-            ]
-        ]
-
-        # Add cancel button
-        keyboard.append([
-            InlineKeyboardButton("❌ Cancel", callback_data=f"draft:cancel:{draft_id}")
-        ])
+        # Build message - escape HTML to prevent parsing errors with email addresses.
+        # Email fields are cut before escaping so long values are never walked in full.
+        escape = self._escape_html
+        message = _DRAFT_REQUEST_TEMPLATE.format_map({
+            'sender': escape(email_data.get('sender_name', email_data.get('sender_email', 'Unknown'))[:100]),
+            'subject': escape(email_data.get('subject', '(no subject)')[:50]),
+            'body_preview': escape(email_data.get('body', '')[:150].translate(_NEWLINE_TRANS)),
+            'instruction': escape(instruction),
+            'recommendation': escape(recommendation),
+        })
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = self._build_draft_keyboard(draft_id)
 
-        await self.bot.send_message(
+        await (await self._submit_send(
             chat_id=chat_id,
             text=message,
             parse_mode='HTML',
             reply_markup=reply_markup
-        )
+        ))
 
         return draft_id
 
+    async def _edit_query_message(self, query, text: str, **kwargs):
+        """Edit the message a button was pressed on, through the send queue."""
+        message = query.message
+        if message is None:
+            # Inline-mode callbacks have no chat message to address
+            return await query.edit_message_text(text, **kwargs)
+        return await (await self._submit_send(
+            'edit_message_text',
+            chat_id=message.chat.id,
+            message_id=message.message_id,
+            text=text,
+            **kwargs
+        ))
+
     async def _handle_callback_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle inline button clicks."""
         query = update.callback_query
@@ -609,53 +1251,52 @@ class TelegramHandler:
         # Always answer the callback to remove loading state
         await query.answer()
 
-        if not self._is_authorized(user_id):
-            await query.edit_message_text("Unauthorized.")
+        message = query.message
+        if not self._is_authorized(user_id, message.chat.id if message else None):
+            await self._edit_query_message(query, "Unauthorized.")
             return
 
         # Parse callback data
-        data = query.data
-        parts = data.split(':')
+        action_type, sep, rest = query.data.partition(':')
 
-        if len(parts) < 2:
-            await query.edit_message_text("Invalid callback data.")
+        if not sep:
+            await self._edit_query_message(query, "Invalid callback data.")
             return
 
-        action_type = parts[0]
-
         if action_type == 'draft':
-            await self._handle_draft_callback(query, parts)
+            await self._handle_draft_callback(query, rest)
         else:
-            await query.edit_message_text(f"Unknown action: {action_type}")
+            await self._edit_query_message(query, f"Unknown action: {action_type}")
 
-    async def _handle_draft_callback(self, query, parts: List[str]):
-        """Handle draft-related callbacks."""
-        if len(parts) < 3:
-            await query.edit_message_text("Invalid draft callback.")
+    async def _handle_draft_callback(self, query, payload: str):
+        """Handle draft-related callbacks (payload is "action:draft_id")."""
+        action, sep, draft_id = payload.partition(':')
+        if not sep:
+            await self._edit_query_message(query, "Invalid draft callback.")
             return
-
-        action = parts[1]
-        draft_id = parts[2]
+        # Ignore any trailing fields after the draft ID
+        draft_id = draft_id.partition(':')[0]
 
         # Get context
         ctx = self._get_draft_context(draft_id)
         if not ctx:
-            await query.edit_message_text(
+            await self._edit_query_message(
+                query,
                 "Draft session expired. Please send your request again."
             )
             return
 
         if action == 'ollama':
             await self.send_typing(query.message.chat_id)
-            await query.edit_message_text("⏳ Generating draft with Ollama...")
+            await self._edit_query_message(query, "⏳ Generating draft with Ollama...")
             await self._draft_with_fallback('ollama', query, draft_id, ctx)
         elif action == 'kimi':
             await self.send_typing(query.message.chat_id)
-            await query.edit_message_text("⏳ Generating draft with Kimi K2...")
+            await self._edit_query_message(query, "⏳ Generating draft with Kimi K2...")
             await self._draft_with_fallback('kimi', query, draft_id, ctx)
         elif action == 'claude':
             await self.send_typing(query.message.chat_id)
-            await query.edit_message_text("⏳ Generating draft with Claude...")
+            await self._edit_query_message(query, "⏳ Generating draft with Claude...")
             await self._draft_with_fallback('claude', query, draft_id, ctx)
         elif action == 'escalate':
             await self._escalate_to_claude(query, draft_id, ctx)
@@ -668,9 +1309,65 @@ class TelegramHandler:
         elif action == 'cancel':
             await self._cancel_draft(query, draft_id, ctx)
         else:
-            await query.edit_message_text(f"Unknown draft action: {action}")
+            await self._edit_query_message(query, f"Unknown draft action: {action}")
+
+    @staticmethod
+    def _draft_cache_key(model: str, ctx: DraftContext) -> tuple:
+        """Key a generated draft by model, email and normalised instruction."""
+        email_data = ctx.email_data or {}
+        # Body and template (which may be a dict) go in as a short digest
+        digest = hashlib.blake2b((email_data.get('body') or '').encode(), digest_size=8)
+        template = ctx.template
+        if template:
+            digest.update(repr(template).encode())
+        return (
+            model,
+            ' '.join((ctx.instruction or '').lower().split()),
+            email_data.get('sender_email'),
+            email_data.get('subject'),
+            digest.digest(),
+        )
+
+    def _get_cached_draft(self, key: tuple) -> Optional[Dict]:
+        """Return a cached draft result that has not expired, else None."""
+        entry = self._draft_cache.get(key)
+        if entry is None:
+            return None
+        expiry, result = entry
+        if expiry < time.monotonic():
+            del self._draft_cache[key]
+            return None
+        self._draft_cache.move_to_end(key)
+        return result
+
+    def _cache_draft(self, key: tuple, result: Dict):
+        """Remember a successful draft result, evicting the least recently used."""
+        if key in self._draft_cache:
+            self._draft_cache.move_to_end(key)
+            return
+        self._draft_cache[key] = (time.monotonic() + _DRAFT_CACHE_TTL, result)
+        if len(self._draft_cache) > _DRAFT_CACHE_SIZE:
+            self._draft_cache.popitem(last=False)
+
+    async def _generate_draft_once(self, key: tuple, method: Callable, ctx: DraftContext, draft_id: str) -> Optional[Dict]:
+        """
+        Run method for key unless the same draft is already being generated,
+        in which case wait for and share that result. A failed generation
+        resolves waiters with None so they move on down the fallback chain.
+        """
+        future = self._inflight_drafts.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = self._inflight_drafts[key] = asyncio.get_running_loop().create_future()
+        result = None
+        try:
+            result = await method(ctx, draft_id)
+            return result
+        finally:
+            del self._inflight_drafts[key]
+            future.set_result(result)
 
-    async def _draft_with_fallback(self, primary: str, query, draft_id: str, ctx: Dict[str, Any]):
+    async def _draft_with_fallback(self, primary: str, query, draft_id: str, ctx: DraftContext):
         """Try primary model, fall back through chain on failure. Notifies user of fallback."""
         chain = ['ollama', 'kimi', 'claude']
         if primary in chain:
@@ -688,8 +1385,12 @@ class TelegramHandler:
             if not method:
                 continue
             try:
-                result = await method(ctx, draft_id)
+                cache_key = self._draft_cache_key(model, ctx)
+                result = self._get_cached_draft(cache_key)
+                if result is None:
+                    result = await self._generate_draft_once(cache_key, method, ctx, draft_id)
                 if result and result.get('success'):
+                    self._cache_draft(cache_key, result)
                     draft_text = result['draft_text']
                     model_label = {'ollama': 'Ollama', 'kimi': 'Kimi K2', 'claude': 'Claude'}[model]
                     confidence = result.get('confidence', 85)
@@ -705,78 +1406,76 @@ class TelegramHandler:
                         'confidence': confidence
                     })
                     await self._show_draft_preview(
-                        query, draft_id, draft_text, model_label, confidence
+                        query, draft_id, ctx, draft_text, model_label, confidence
                     )
                     return
                 # result was False or not successful, try next
-                logger.warning(f"Draft with {model} returned non-success, trying next")
+                logger.warning("Draft with %s returned non-success, trying next", model)
             except Exception as e:
-                logger.warning(f"Draft with {model} failed: {e}, trying next")
+                logger.warning("Draft with %s failed: %s, trying next", model, e)
                 continue
 
-        await query.edit_message_text(
+        await self._edit_query_message(
+            query,
             "All AI models are currently unavailable. Please try again later."
         )
 
-    async def _draft_with_ollama_inner(self, ctx: Dict[str, Any], draft_id: str) -> Optional[Dict]:
+    async def _draft_with_ollama_inner(self, ctx: DraftContext, draft_id: str) -> Optional[Dict]:
         """Generate draft using Ollama (internal, returns result dict)."""
-        from ollama_client import OllamaClient
-        ollama = OllamaClient()
-        result = ollama.generate_draft(
-            email_data=ctx['email_data'],
-            instruction=ctx['instruction'],
-            template=ctx.get('pattern_match', {}).get('template') if ctx.get('pattern_match') else None
+        ollama = self._get_client('ollama')
+        result = await asyncio.to_thread(
+            ollama.generate_draft,
+            email_data=ctx.email_data,
+            instruction=ctx.instruction,
+            template=ctx.template
         )
-        del ollama
         if result.get('success'):
             return {'success': True, 'draft_text': result.get('draft_text', ''), 'confidence': result.get('confidence', 70)}
         return None
 
-    async def _draft_with_kimi_inner(self, ctx: Dict[str, Any], draft_id: str) -> Optional[Dict]:
+    async def _draft_with_kimi_inner(self, ctx: DraftContext, draft_id: str) -> Optional[Dict]:
         """Generate draft using Kimi K2 (internal, returns result dict)."""
-        from kimi_client import KimiClient
-        kimi = KimiClient()
+        kimi = self._get_client('kimi')
         if not kimi.is_available():
             return None
-        result = kimi.generate_email_draft(
-            email_data=ctx['email_data'],
-            instruction=ctx['instruction'],
-            template=ctx.get('pattern_match', {}).get('template') if ctx.get('pattern_match') else None
+        result = await asyncio.to_thread(
+            kimi.generate_email_draft,
+            email_data=ctx.email_data,
+            instruction=ctx.instruction,
+            template=ctx.template
         )
-        del kimi
         if result.get('success'):
             return {'success': True, 'draft_text': result.get('draft_text', ''), 'confidence': 95}
         return None
 
-    async def _draft_with_claude_inner(self, ctx: Dict[str, Any], draft_id: str) -> Optional[Dict]:
+    async def _draft_with_claude_inner(self, ctx: DraftContext, draft_id: str) -> Optional[Dict]:
         """Generate draft using Claude (internal, returns result dict)."""
-        from claude_client import ClaudeClient
-        claude = ClaudeClient()
+        claude = self._get_client('claude')
         if not claude.is_available():
             return None
-        result = claude.generate_email_draft(
-            email_data=ctx['email_data'],
-            instruction=ctx['instruction'],
-            template=ctx.get('pattern_match', {}).get('template') if ctx.get('pattern_match') else None
+        result = await asyncio.to_thread(
+            claude.generate_email_draft,
+            email_data=ctx.email_data,
+            instruction=ctx.instruction,
+            template=ctx.template
         )
-        del claude
         if result.get('success'):
             return {'success': True, 'draft_text': result.get('draft_text', ''), 'confidence': 95}
         return None
 
-    async def _draft_with_ollama(self, query, draft_id: str, ctx: Dict[str, Any]):
+    async def _draft_with_ollama(self, query, draft_id: str, ctx: DraftContext):
         """Generate draft using Ollama."""
         await self.send_typing(query.message.chat_id)
-        await query.edit_message_text("⏳ Generating draft with Ollama...")
+        await self._edit_query_message(query, "⏳ Generating draft with Ollama...")
 
         try:
-            from ollama_client import OllamaClient
-            ollama = OllamaClient()
+            ollama = self._get_client('ollama')
 
-            result = ollama.generate_draft(
-                email_data=ctx['email_data'],
-                instruction=ctx['instruction'],
-                template=ctx.get('pattern_match', {}).get('template') if ctx.get('pattern_match') else None
+            result = await asyncio.to_thread(
+                ollama.generate_draft,
+                email_data=ctx.email_data,
+                instruction=ctx.instruction,
+                template=ctx.template
             )
 
             if result.get('success'):
@@ -792,44 +1491,45 @@ class TelegramHandler:
 
                 # Show draft with action buttons
                 await self._show_draft_preview(
-                    query, draft_id, draft_text, 'Ollama', confidence
+                    query, draft_id, ctx, draft_text, 'Ollama', confidence
                 )
             else:
                 error = result.get('error', 'Unknown error')
-                await query.edit_message_text(
+                await self._edit_query_message(
+                    query,
                     f"❌ Ollama draft failed: {error}\n\n"
                     f"Try Claude instead?"
                 )
 
-            del ollama
-
         except Exception as e:
-            logger.error(f"Ollama draft error: {e}")
-            await query.edit_message_text(
+            logger.error("Ollama draft error: %s", e)
+            await self._edit_query_message(
+                query,
                 f"❌ Error generating draft: {str(e)[:200]}\n\n"
                 f"Try Claude instead?"
             )
 
-    async def _draft_with_kimi(self, query, draft_id: str, ctx: Dict[str, Any]):
+    async def _draft_with_kimi(self, query, draft_id: str, ctx: DraftContext):
         """Generate draft using Kimi K2."""
         await self.send_typing(query.message.chat_id)
-        await query.edit_message_text("⏳ Generating draft with Kimi K2...")
+        await self._edit_query_message(query, "⏳ Generating draft with Kimi K2...")
 
         try:
-            from kimi_client import KimiClient
-            kimi = KimiClient()
+            kimi = self._get_client('kimi')
 
             if not kimi.is_available():
-                await query.edit_message_text(
+                await self._edit_query_message(
+                    query,
                     "❌ Kimi API not configured.\n\n"
                     "Set NVIDIA_API_KEY in m1_config.py or environment."
                 )
                 return
 
-            result = kimi.generate_email_draft(
-                email_data=ctx['email_data'],
-                instruction=ctx['instruction'],
-                template=ctx.get('pattern_match', {}).get('template') if ctx.get('pattern_match') else None
+            result = await asyncio.to_thread(
+                kimi.generate_email_draft,
+                email_data=ctx.email_data,
+                instruction=ctx.instruction,
+                template=ctx.template
             )
 
             if result.get('success'):
@@ -844,38 +1544,37 @@ class TelegramHandler:
 
                 # Show draft with action buttons
                 await self._show_draft_preview(
-                    query, draft_id, draft_text, 'Kimi K2', 95
+                    query, draft_id, ctx, draft_text, 'Kimi K2', 95
                 )
             else:
                 error = result.get('error', 'Unknown error')
-                await query.edit_message_text(f"❌ Kimi draft failed: {error}")
-
-            del kimi
+                await self._edit_query_message(query, f"❌ Kimi draft failed: {error}")
 
         except Exception as e:
-            logger.error(f"Kimi draft error: {e}")
-            await query.edit_message_text(f"❌ Error: {str(e)[:200]}")
+            logger.error("Kimi draft error: %s", e)
+            await self._edit_query_message(query, f"❌ Error: {str(e)[:200]}")
 
-    async def _draft_with_claude(self, query, draft_id: str, ctx: Dict[str, Any]):
+    async def _draft_with_claude(self, query, draft_id: str, ctx: DraftContext):
         """Generate draft using Claude."""
         await self.send_typing(query.message.chat_id)
-        await query.edit_message_text("⏳ Generating draft with Claude...")
+        await self._edit_query_message(query, "⏳ Generating draft with Claude...")
 
         try:
-            from claude_client import ClaudeClient
-            claude = ClaudeClient()
+            claude = self._get_client('claude')
 
             if not claude.is_available():
-                await query.edit_message_text(
+                await self._edit_query_message(
+                    query,
                     "❌ Claude API not configured.\n\n"
                     "Set ANTHROPIC_API_KEY in m1_config.py or environment."
                 )
                 return
 
-            result = claude.generate_email_draft(
-                email_data=ctx['email_data'],
-                instruction=ctx['instruction'],
-                template=ctx.get('pattern_match', {}).get('template') if ctx.get('pattern_match') else None
+            result = await asyncio.to_thread(
+                claude.generate_email_draft,
+                email_data=ctx.email_data,
+                instruction=ctx.instruction,
+                template=ctx.template
             )
 
             if result.get('success'):
@@ -890,42 +1589,41 @@ class TelegramHandler:
 
                 # Show draft with action buttons
                 await self._show_draft_preview(
-                    query, draft_id, draft_text, 'Claude', 95
+                    query, draft_id, ctx, draft_text, 'Claude', 95
                 )
             else:
                 error = result.get('error', 'Unknown error')
-                await query.edit_message_text(f"❌ Claude draft failed: {error}")
-
-            del claude
+                await self._edit_query_message(query, f"❌ Claude draft failed: {error}")
 
         except Exception as e:
-            logger.error(f"Claude draft error: {e}")
-            await query.edit_message_text(f"❌ Error: {str(e)[:200]}")
+            logger.error("Claude draft error: %s", e)
+            await self._edit_query_message(query, f"❌ Error: {str(e)[:200]}")
 
-    async def _escalate_to_claude(self, query, draft_id: str, ctx: Dict[str, Any]):
+    async def _escalate_to_claude(self, query, draft_id: str, ctx: DraftContext):
         """Refine Ollama draft with Claude."""
-        ollama_draft = ctx.get('draft_text')
+        ollama_draft = ctx.draft_text
         if not ollama_draft:
-            await query.edit_message_text("No draft to escalate.")
+            await self._edit_query_message(query, "No draft to escalate.")
             return
 
         await self.send_typing(query.message.chat_id)
-        await query.edit_message_text("⏳ Refining draft with Claude...")
+        await self._edit_query_message(query, "⏳ Refining draft with Claude...")
 
         try:
-            from claude_client import ClaudeClient
-            claude = ClaudeClient()
+            claude = self._get_client('claude')
 
             if not claude.is_available():
-                await query.edit_message_text(
+                await self._edit_query_message(
+                    query,
                     "❌ Claude API not configured.\n\n"
                     "Set ANTHROPIC_API_KEY in m1_config.py or environment."
                 )
                 return
 
-            result = claude.refine_draft(
+            result = await asyncio.to_thread(
+                claude.refine_draft,
                 original_draft=ollama_draft,
-                email_data=ctx['email_data'],
+                email_data=ctx.email_data,
                 instructions="Improve tone, clarity, and completeness"
             )
 
@@ -946,43 +1644,42 @@ class TelegramHandler:
                 changes_text = '\n'.join(f"• {c}" for c in changes[:3]) if changes else "Minor improvements"
 
                 await self._show_draft_preview(
-                    query, draft_id, refined_draft, 'Claude (refined)',
+                    query, draft_id, ctx, refined_draft, 'Claude (refined)',
                     95, extra_info=f"\n\n<b>Changes:</b>\n{changes_text}"
                 )
             else:
                 error = result.get('error', 'Unknown error')
-                await query.edit_message_text(f"❌ Refinement failed: {error}")
-
-            del claude
+                await self._edit_query_message(query, f"❌ Refinement failed: {error}")
 
         except Exception as e:
-            logger.error(f"Claude escalation error: {e}")
-            await query.edit_message_text(f"❌ Error: {str(e)[:200]}")
+            logger.error("Claude escalation error: %s", e)
+            await self._edit_query_message(query, f"❌ Error: {str(e)[:200]}")
 
-    async def _escalate_to_kimi(self, query, draft_id: str, ctx: Dict[str, Any]):
+    async def _escalate_to_kimi(self, query, draft_id: str, ctx: DraftContext):
         """Refine Ollama draft with Kimi K2."""
-        ollama_draft = ctx.get('draft_text')
+        ollama_draft = ctx.draft_text
         if not ollama_draft:
-            await query.edit_message_text("No draft to refine.")
+            await self._edit_query_message(query, "No draft to refine.")
             return
 
         await self.send_typing(query.message.chat_id)
-        await query.edit_message_text("⏳ Refining draft with Kimi K2...")
+        await self._edit_query_message(query, "⏳ Refining draft with Kimi K2...")
 
         try:
-            from kimi_client import KimiClient
-            kimi = KimiClient()
+            kimi = self._get_client('kimi')
 
             if not kimi.is_available():
-                await query.edit_message_text(
+                await self._edit_query_message(
+                    query,
                     "❌ Kimi API not configured.\n\n"
                     "Set NVIDIA_API_KEY in m1_config.py or environment."
                 )
                 return
 
-            result = kimi.refine_draft(
+            result = await asyncio.to_thread(
+                kimi.refine_draft,
                 original_draft=ollama_draft,
-                email_data=ctx['email_data'],
+                email_data=ctx.email_data,
                 instructions="Improve tone, clarity, and completeness"
             )
 
@@ -1003,31 +1700,29 @@ class TelegramHandler:
                 changes_text = '\n'.join(f"• {c}" for c in changes[:3]) if changes else "Minor improvements"
 
                 await self._show_draft_preview(
-                    query, draft_id, refined_draft, 'Kimi K2 (refined)',
+                    query, draft_id, ctx, refined_draft, 'Kimi K2 (refined)',
                     95, extra_info=f"\n\n<b>Changes:</b>\n{changes_text}"
                 )
             else:
                 error = result.get('error', 'Unknown error')
-                await query.edit_message_text(f"❌ Refinement failed: {error}")
-
-            del kimi
+                await self._edit_query_message(query, f"❌ Refinement failed: {error}")
 
         except Exception as e:
-            logger.error(f"Kimi escalation error: {e}")
-            await query.edit_message_text(f"❌ Error: {str(e)[:200]}")
+            logger.error("Kimi escalation error: %s", e)
+            await self._edit_query_message(query, f"❌ Error: {str(e)[:200]}")
 
     async def _show_draft_preview(
         self,
         query,
         draft_id: str,
+        ctx: DraftContext,
         draft_text: str,
         model: str,
         confidence: int,
         extra_info: str = ""
     ):
-        """Show draft preview with action buttons."""
-        ctx = self._get_draft_context(draft_id)
-        email_data = ctx.get('email_data', {}) if ctx else {}
+        """Show draft preview with action buttons for the caller's draft context."""
+        email_data = ctx.email_data or {}
 
         # Format preview
         to = email_data.get('sender_email', 'Unknown')
@@ -1049,51 +1744,42 @@ class TelegramHandler:
             f"{extra_info}"
         )
 
-        # Build action buttons
-        keyboard = [[
-            InlineKeyboardButton("✅ Approve", callback_data=f"draft:approve:{draft_id}"),
-        ]]
-
-        # Add refine options if Ollama was used
-        if model == 'Ollama':
-            keyboard.append([
-                InlineKeyboardButton("🔄 Refine w/ Kimi", callback_data=f"draft:escalate_kimi:{draft_id}"),
-                InlineKeyboardButton("🔄 Refine w/ Claude", callback_data=f"draft:escalate:{draft_id}")
-            ])
-
-        keyboard.append([
-            InlineKeyboardButton("❌ Cancel", callback_data=f"draft:cancel:{draft_id}")
-        ])
-
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        # Refine options only make sense if Ollama was used
+        reply_markup = self._build_preview_keyboard(
+            draft_id, include_escalate=(model == 'Ollama')
+        )
 
-        await query.edit_message_text(
+        await self._edit_query_message(
+            query,
             text=message,
             parse_mode='HTML',
             reply_markup=reply_markup
         )
 
-    async def _approve_and_save(self, query, draft_id: str, ctx: Dict[str, Any]):
+    async def _approve_and_save(self, query, draft_id: str, ctx: DraftContext):
         """Save approved draft to Gmail."""
-        draft_text = ctx.get('draft_text')
+        draft_text = ctx.draft_text
         if not draft_text:
-            await query.edit_message_text("No draft to save.")
+            await self._edit_query_message(query, "No draft to save.")
             return
 
         await self.send_typing(query.message.chat_id)
-        await query.edit_message_text("⏳ Saving draft to Gmail...")
+        await self._edit_query_message(query, "⏳ Saving draft to Gmail...")
 
         try:
-            from gmail_client import GmailClient
-            gmail = GmailClient()
-            gmail.authenticate()
-
-            email_data = ctx.get('email_data', {})
-
-            result = gmail.create_reply_draft(
-                email=email_data,
-                body=draft_text
-            )
+            # Shared client: OAuth and the API service are set up on first use
+            gmail = self._get_client('gmail')
+
+            email_data = ctx.email_data or {}
+
+            # The Gmail service's httplib2 transport is not thread-safe, so
+            # approvals from different chats take turns on the shared client
+            async with self._gmail_lock:
+                result = await asyncio.to_thread(
+                    gmail.create_reply_draft,
+                    email=email_data,
+                    body=draft_text
+                )
 
             if result.get('success'):
                 draft_url = result.get('draft_url', '')
@@ -1102,59 +1788,87 @@ class TelegramHandler:
                     f"✅ <b>Draft Saved!</b>\n\n"
                     f"<b>To:</b> {email_data.get('sender_email', 'Unknown')}\n"
                     f"<b>Subject:</b> Re: {email_data.get('subject', '')[:40]}\n"
-                    f"<b>Model:</b> {ctx.get('model_used', 'Unknown')}\n\n"
+                    f"<b>Model:</b> {ctx.model_used or 'Unknown'}\n\n"
                     f"<a href=\"{draft_url}\">Open in Gmail</a>"
                 )
 
-                await query.edit_message_text(
+                await self._edit_query_message(
+                    query,
                     text=message,
                     parse_mode='HTML'
                 )
 
                 # Cleanup context
-                if draft_id in self._draft_contexts:
-                    del self._draft_contexts[draft_id]
+                self._draft_contexts.pop(draft_id, None)
             else:
                 error = result.get('error', 'Unknown error')
-                await query.edit_message_text(f"❌ Failed to save draft: {error}")
+                await self._edit_query_message(query, f"❌ Failed to save draft: {error}")
 
         except Exception as e:
-            logger.error(f"Gmail save error: {e}")
-            await query.edit_message_text(f"❌ Error saving: {str(e)[:200]}")
+            logger.error("Gmail save error: %s", e)
+            await self._edit_query_message(query, f"❌ Error saving: {str(e)[:200]}")
 
-    async def _request_edit(self, query, draft_id: str, ctx: Dict[str, Any]):
+    async def _request_edit(self, query, draft_id: str, ctx: DraftContext):
         """Request user to provide edit instructions."""
-        await query.edit_message_text(
+        await self._edit_query_message(
+            query,
             "Send your edit instructions as a new message.\n"
             "Example: 'Make it more formal' or 'Add urgency'\n\n"
             "(This feature is coming soon)"
         )
 
-    async def _cancel_draft(self, query, draft_id: str, ctx: Dict[str, Any]):
+    async def _cancel_draft(self, query, draft_id: str, ctx: DraftContext):
         """Cancel draft creation."""
         # Cleanup context
-        if draft_id in self._draft_contexts:
-            del self._draft_contexts[draft_id]
+        self._draft_contexts.pop(draft_id, None)
 
-        await query.edit_message_text("❌ Draft cancelled.")
+        await self._edit_query_message(query, "❌ Draft cancelled.")
 
     # ==================
     # SENDING RESPONSES
     # ==================
 
-    async def send_response(self, chat_id: int, message: str):
+    async def send_response(
+        self,
+        chat_id: int,
+        message: str,
+        wait: bool = True,
+        parse_mode: Optional[str] = 'HTML'
+    ):
         """
         Send a response message to a chat.
 
+        Messages go through the rate-limited send queue (global and per-chat
+        limits) to stay under Telegram's flood limits.
+
         Args:
             chat_id: Telegram chat ID
             message: Message text to send
+            wait: Wait for delivery; if False, return as soon as the message
+                  is queued (send errors are logged instead of raised)
+            parse_mode: Telegram parse mode, or None for plain text (skips
+                        entity parsing)
+
+        Returns:
+            The sent Telegram Message (the last part of a split message),
+            or None when not waiting
         """
-        await self.bot.send_message(
-            chat_id=chat_id,
-            text=message,
-            parse_mode='HTML'
-        )
+        if len(message) > _MAX_MESSAGE_LENGTH:
+            # Telegram rejects longer texts; send the leading parts first and
+            # wait for each so the parts arrive in order
+            split = _split_html_message if parse_mode == 'HTML' else _split_message
+            *head, message = split(message, _MAX_MESSAGE_LENGTH)
+            for part in head:
+                await self.send_response(chat_id, part, parse_mode=parse_mode)
+
+        kwargs = {'chat_id': chat_id, 'text': message}
+        if parse_mode:
+            kwargs['parse_mode'] = parse_mode
+        future = await self._submit_send(**kwargs)
+        if not wait:
+            future.add_done_callback(self._log_send_failure)
+            return None
+        return await future
 
     async def send_message(self, chat_id: int = None, text: str = ""):
         """
@@ -1168,6 +1882,91 @@ class TelegramHandler:
         if target_chat:
             await self.send_response(target_chat, text)
 
+    def _may_notify(self, chat_id: int) -> bool:
+        """
+        Allow notifications only to allowed users, chats they have used the
+        bot from, or the admin chat.
+        """
+        allowed = self._allowed_users_set
+        if (not allowed or chat_id in allowed or chat_id in self._authorized_chats
+                or chat_id == self.admin_chat_id):
+            return True
+        logger.warning("Dropping notification to unauthorized chat %s", chat_id)
+        return False
+
+    def _queue_notification(
+        self,
+        chat_id: int,
+        text: str,
+        parse_mode: Optional[str] = None,
+        draft_url: Optional[str] = None
+    ):
+        """
+        Hold a notification briefly so a burst to one chat goes out as a
+        single digest message instead of one message per event.
+        """
+        self._pending_notifications.setdefault(chat_id, []).append((text, parse_mode, draft_url))
+        loop = asyncio.get_running_loop()
+        task = self._flush_tasks.get(chat_id)
+        # A finished flush, or one left behind on an earlier event loop, will
+        # never send these
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._flush_tasks[chat_id] = loop.create_task(self._flush_notifications(chat_id))
+
+    async def _flush_notifications(self, chat_id: int):
+        """Send a chat's pending notifications once the coalescing window closes."""
+        try:
+            try:
+                await asyncio.sleep(_COALESCE_WINDOW)
+            finally:
+                if self._flush_tasks.get(chat_id) is asyncio.current_task():
+                    del self._flush_tasks[chat_id]
+        except asyncio.CancelledError:
+            # Cancelled with its loop (e.g. asyncio.run returning): the send
+            # workers go down too, so deliver directly instead of dropping
+            await self._send_pending_notifications(chat_id, direct=True)
+            raise
+        await self._send_pending_notifications(chat_id)
+
+    async def _send_pending_notifications(self, chat_id: int, direct: bool = False):
+        """
+        Merge pending notifications into as few messages as possible.
+
+        With direct=True the messages bypass the send queue and are
+        delivered one by one before returning.
+        """
+        items = self._pending_notifications.pop(chat_id, None)
+        if not items:
+            return
+
+        # Consecutive items with the same parse_mode share a message, as long
+        # as the merged text fits Telegram's message length limit
+        batches = []  # [parse_mode, texts, urls, length]
+        for text, parse_mode, draft_url in items:
+            batch = batches[-1] if batches else None
+            if (batch is None or batch[0] != parse_mode
+                    or batch[3] + len(_DIGEST_SEPARATOR) + len(text) > _MAX_MESSAGE_LENGTH):
+                batch = [parse_mode, [], [], -len(_DIGEST_SEPARATOR)]
+                batches.append(batch)
+            batch[1].append(text)
+            if draft_url:
+                batch[2].append(draft_url)
+            batch[3] += len(_DIGEST_SEPARATOR) + len(text)
+
+        for parse_mode, texts, urls, _ in batches:
+            kwargs = {'chat_id': chat_id, 'text': _DIGEST_SEPARATOR.join(texts)}
+            if parse_mode:
+                kwargs['parse_mode'] = parse_mode
+            if urls:
+                kwargs['reply_markup'] = self._build_open_draft_keyboard(urls)
+            if direct:
+                future = self._bind_send_loop().create_future()
+                await self._deliver('send_message', kwargs, future)
+            else:
+                # Waits for queue space rather than dropping error/escalation notices
+                future = await self._submit_send(**kwargs)
+            future.add_done_callback(self._log_send_failure)
+
     async def send_draft_notification(
         self,
         chat_id: int,
@@ -1186,23 +1985,17 @@ class TelegramHandler:
             confidence: Confidence score
             route: Routing decision
         """
-        status_emoji = ""
-        if route == 'ollama_only':
-            status_emoji = "AI generated"
-        elif route == 'ollama_with_review':
-            status_emoji = "Needs review"
-        else:
-            status_emoji = "Escalated"
+        if not self._may_notify(chat_id):
+            return
 
-        message = (
-            f"Draft Created\n\n"
-            f"Re: {email_subject[:50]}\n"
-            f"Confidence: {confidence}%\n"
-            f"Status: {status_emoji}\n\n"
-            f"<a href=\"{draft_url}\">Open Draft in Gmail</a>"
+        message = _DRAFT_NOTIFICATION_TEMPLATE.format(
+            subject=_truncate(email_subject, 50),
+            confidence=confidence,
+            status=_ROUTE_STATUS.get(route, "Escalated")
         )
 
-        await self.send_response(chat_id, message)
+        # No parse_mode: the text carries no markup, the link is a button
+        self._queue_notification(chat_id, message, draft_url=draft_url or None)
 
     async def send_error_notification(
         self,
@@ -1211,12 +2004,15 @@ class TelegramHandler:
         error: str
     ):
         """Send an error notification."""
-        message = (
-            f"Error Processing Email\n\n"
-            f"Reference: {email_reference[:50]}\n"
-            f"Error: {error[:200]}"
+        if not self._may_notify(chat_id):
+            return
+
+        # Plain text: no markup, so no escaping or entity parsing needed
+        message = _ERROR_NOTIFICATION_TEMPLATE.format(
+            reference=_truncate(email_reference, 50),
+            error=_truncate(error, 200)
         )
-        await self.send_response(chat_id, message)
+        self._queue_notification(chat_id, message)
 
     async def send_escalation_notification(
         self,
@@ -1226,14 +2022,15 @@ class TelegramHandler:
         reason: str
     ):
         """Send an escalation notification (low confidence)."""
-        message = (
-            f"Escalated to Claude Desktop\n\n"
-            f"Re: {email_subject[:50]}\n"
-            f"Confidence: {confidence}%\n"
-            f"Reason: {reason}\n\n"
-            f"Handle via Claude Desktop when at work laptop."
+        if not self._may_notify(chat_id):
+            return
+
+        message = _ESCALATION_NOTIFICATION_TEMPLATE.format(
+            subject=_truncate(email_subject, 50),
+            confidence=confidence,
+            reason=reason
         )
-        await self.send_response(chat_id, message)
+        self._queue_notification(chat_id, message)
 
     # ==================
     # RUNNING THE BOT
@@ -1247,27 +2044,112 @@ class TelegramHandler:
             message_callback: Async function to call when a message is received
         """
         self.setup_bot(message_callback)
+        if _install_uvloop():
+            logger.info("Using uvloop event loop")
         logger.info("Starting Telegram bot...")
-        self.application.run_polling(allowed_updates=Update.ALL_TYPES)
+        self.application.run_polling(
+            poll_interval=0.0,
+            timeout=_POLL_TIMEOUT,
+            allowed_updates=Update.ALL_TYPES
+        )
 
     async def run_async(self, message_callback: Callable = None):
         """
         Start the bot asynchronously.
 
+        Runs on the caller's event loop; to get uvloop here, install its
+        policy before the loop is created (e.g. before asyncio.run).
+
         Args:
             message_callback: Async function to call when a message is received
         """
         self.setup_bot(message_callback)
-        await self.application.initialize()
-        await self.application.start()
-        await self.application.updater.start_polling()
+        self._stop_event = asyncio.Event()
+        await self.application.initialize()  # no-op when restarting
+        if not self.application.running:
+            await self.application.start()
+        if not self.application.updater.running:
+            await self.application.updater.start_polling(
+                poll_interval=0.0,
+                timeout=_POLL_TIMEOUT,
+                allowed_updates=Update.ALL_TYPES
+            )
+
+    async def run_until_stopped(self, message_callback: Callable = None):
+        """
+        Start the bot and block until stop_async() is called.
+
+        For task supervisors: returning means the bot was stopped on purpose
+        (see stopped), so it should not be restarted. Cancellation shuts the
+        bot down fully.
+        """
+        await self.run_async(message_callback)
+        try:
+            await self._stop_event.wait()
+        except asyncio.CancelledError:
+            await self.shutdown_async()
+            raise
+
+    @property
+    def stopped(self) -> bool:
+        """True once stop_async() has stopped the bot started by run_async()."""
+        return self._stop_event is not None and self._stop_event.is_set()
+
+    async def flush_async(self, timeout: float = 10):
+        """
+        Send pending notifications and wait for the send queue to drain.
+
+        Call before leaving an event loop that queued messages (e.g. one run
+        with asyncio.run); whatever is still queued is lost when it closes.
+        """
+        # Send any notifications still inside their coalescing window, then
+        # cancel their flush timers (which now find nothing left to send)
+        loop = asyncio.get_running_loop()
+        flush_tasks = list(self._flush_tasks.values())
+        self._flush_tasks.clear()
+        for chat_id in list(self._pending_notifications):
+            await self._send_pending_notifications(chat_id)
+        for task in flush_tasks:
+            if task.get_loop() is loop:
+                task.cancel()
+        if self._send_loop is not loop:
+            return
+        deadline = loop.time() + timeout
+        while self._send_workers:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.warning(
+                    "Timed out flushing %d queued messages",
+                    sum(map(len, self._send_lanes.values()))
+                )
+                break
+            await asyncio.wait(list(self._send_workers), timeout=remaining)
 
     async def stop_async(self):
-        """Stop the bot asynchronously."""
+        """
+        Stop polling asynchronously.
+
+        The Application is kept so a later run_async() restarts it without
+        rebuilding; use shutdown_async() on program exit.
+        """
+        await self.flush_async()
+        if self._send_loop is asyncio.get_running_loop():
+            for worker in list(self._send_workers):
+                worker.cancel()
+        if self.application:
+            if self.application.updater.running:
+                await self.application.updater.stop()
+            if self.application.running:
+                await self.application.stop()
+        if self._stop_event:
+            self._stop_event.set()
+
+    async def shutdown_async(self):
+        """Stop the bot and release the Application and its HTTP connections."""
+        await self.stop_async()
         if self.application:
-            await self.application.updater.stop()
-            await self.application.stop()
             await self.application.shutdown()
+            self.application = None
 
 
 # ==================
@@ -1275,46 +2157,40 @@ class TelegramHandler:
 # ==================
 
 def test_message_parsing():
-    """Test message parsing without running the bot."""
+    """Test message parsing without running the bot (works without python-telegram-bot)."""
     print("Testing Message Parsing...")
     print("=" * 60)
 
     # Create handler with dummy token
-    try:
-        handler = TelegramHandler.__new__(TelegramHandler)
-        handler.bot_token = "test"
-        handler.allowed_users = []
-        handler.processor = None
-
-        test_messages = [
-            "Re: W9 Request - send W9 and wiring instructions",
-            "From john@example.com - confirm payment received",
-            "latest from sarah@company.com - schedule meeting",
-            "Budget Q4 - approve the numbers",
-            "invoice processing quarterly - confirm receipt",
-            "/status",
-            "/help",
-            "just some random text",
-        ]
-
-        for msg in test_messages:
-            result = handler.parse_message(msg)
-            print(f"\nInput: {msg}")
-            print(f"  Valid: {result['valid']}")
-            print(f"  Reference: {result.get('email_reference', 'N/A')}")
-            print(f"  Instruction: {result.get('instruction', 'N/A')}")
-            print(f"  Search type: {result.get('search_type', 'N/A')}")
-            if 'command' in result:
-                print(f"  Command: {result['command']}")
-
-    except TelegramHandlerError as e:
-        # Expected if telegram library not installed
-        print(f"Note: {e}")
+    handler = TelegramHandler.__new__(TelegramHandler)
+    handler.bot_token = "test"
+    handler.allowed_users = []
+    handler.processor = None
+
+    test_messages = [
+        "Re: W9 Request - send W9 and wiring instructions",
+        "From john@example.com - confirm payment received",
+        "latest from sarah@company.com - schedule meeting",
+        "Budget Q4 - approve the numbers",
+        "invoice processing quarterly - confirm receipt",
+        "/status",
+        "/help",
+        "just some random text",
+    ]
+
+    for msg in test_messages:
+        result = handler.parse_message(msg)
+        print(f"\nInput: {msg}")
+        print(f"  Valid: {result['valid']}")
+        print(f"  Reference: {result.get('email_reference', 'N/A')}")
+        print(f"  Instruction: {result.get('instruction', 'N/A')}")
+        print(f"  Search type: {result.get('search_type', 'N/A')}")
+        if 'command' in result:
+            print(f"  Command: {result['command']}")
 
 
 if __name__ == "__main__":
     if not TELEGRAM_AVAILABLE:
-        print("Telegram package not installed.")
+        print("Telegram package not installed (parsing only).")
         print("Run: pip install python-telegram-bot[job-queue]")
-    else:
-        test_message_parsing()
+    test_message_parsing()
@@ -20,6 +20,29 @@ from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
 
 logger = logging.getLogger(__name__)
 
+# Word lists for _is_legacy_email_format
+_LEGACY_CASUAL_SECOND_WORDS = frozenset({
+    'now', 'here', 'there', 'what', 'where', 'my', 'the', 'this', 'that',
+})
+_LEGACY_CONVERSATIONAL_STARTS = frozenset({
+    'add', 'remind', 'create', 'show', 'list', 'tell', 'give',
+    'hi', 'hello', 'hey', 'thanks', 'ok', 'cool', 'yes', 'no',
+    'sure', 'great', 'nice', 'i', 'we', 'you', 'my', 'the',
+    'what', 'why', 'how', 'when', 'where', 'who', 'can', 'could',
+    'would', 'should', 'please', 'just', 'actually', 'maybe',
+})
+# Email action words, matched anywhere in the instruction in one scan
+_LEGACY_EMAIL_ACTION_RE = _re.compile(
+    'send|reply|respond|draft|forward|confirm|acknowledge|approve|reject|follow up|followup'
+)
+
+_CASUAL_RESPONSES = (
+    "I'm doing great! How can I help you today?",
+    "All systems running smoothly! What do you need?",
+    "I'm here and ready to help! What's on your agenda?",
+    "Doing well! What can I assist with?",
+)
+
 # Type hints for circular import prevention
 if TYPE_CHECKING:
     from telegram_handler import TelegramHandler
@@ -75,6 +98,82 @@ class Intent(Enum):
     COMMAND = "command"                # Explicit /command
 
 
+def _phrase_re(phrases) -> "_re.Pattern":
+    """Compile phrases into one pattern that finds any of them as a substring."""
+    return _re.compile('|'.join(_re.escape(p) for p in phrases))
+
+
+# Keyword tables for ConversationManager.classify_intent, built once; each
+# phrase list is a single alternation so a message is scanned once per list
+_PUNCTUATION_RE = _re.compile(r'[^\w\s]')
+
+_TREE_TO_INTENT = {
+    "email_action": Intent.EMAIL_DRAFT,
+    "todo_add": Intent.TODO_ADD,
+    "idea_bounce": Intent.IDEA_BOUNCE,
+    "skill_finalize": Intent.SKILL_FINALIZE,
+    "casual": Intent.CASUAL_CHAT,
+    "clarification_needed": Intent.UNCLEAR,
+}
+
+# Greetings (flexible matching - handles "Hello!", "hey there", "Hi!", etc.)
+_GREETING_WORDS = (
+    'hi', 'hello', 'hey', 'yo', 'sup', 'hiya', 'heya', 'howdy',
+    'morning', 'afternoon', 'evening', 'good morning', 'good afternoon',
+    'good evening', 'gm', 'whats up', 'wassup', "what's up",
+)
+_GREETING_SET = frozenset(_GREETING_WORDS)
+_GREETING_PREFIXES = tuple(g + ' ' for g in _GREETING_WORDS)
+_GREETING_EMAIL_WORDS_RE = _phrase_re(
+    ['email', 'draft', 'send', 'reply', 'forward', 'find', 'search']
+)
+
+# Casual chat patterns (more comprehensive)
+_CASUAL_PREFIXES = (
+    "how are you", "how's it going", "hows it going", "how ya doing",
+    "what's up", "whats up", "wassup", "sup",
+    "how's everything", "hows everything",
+    "thanks", "thank you", "thx", "ty",
+    "cool", "nice", "great", "awesome", "ok", "okay", "k",
+    "got it", "understood", "makes sense",
+    "never mind", "nevermind", "nvm", "forget it",
+    "bye", "goodbye", "later", "see ya", "ttyl",
+    "lol", "haha", "hehe",
+)
+_CASUAL_CHAT_RE = _phrase_re(
+    ["how are you", "what's up", "whats up", "wassup", "how's it going"]
+)
+
+_BRAINSTORM_PREFIXES = ('brainstorm ', 'brianstorm ', 'branstorm ', 'brain storm ', 'brainstrom ')
+_BRAINSTORM_SHOW_PHRASES = ('show brainstorms', 'brainstorms', 'show brainstorm',
+                            'my brainstorms', 'list brainstorms', 'recent brainstorms')
+_BRAINSTORM_SHOW_SET = frozenset(_BRAINSTORM_SHOW_PHRASES)
+
+_IDEA_RE = _phrase_re(['help me think', 'bounce idea', 'feedback on', 'what do you think',
+                       'think through', 'explore this idea'])
+_HELP_RE = _phrase_re(['help', 'what can you do', 'how do i', 'how to', 'what are you',
+                       'what do you do', 'can you help', 'i need help',
+                       'show me how', 'teach me', 'explain', 'instructions'])
+_STATUS_PHRASES = frozenset({'status', 'whats happening', "what's happening", 'anything new',
+                             'updates', 'what did i miss'})
+
+_TODO_VERB_RE = _phrase_re(['add', 'create', 'new'])
+_TODO_NOUN_RE = _phrase_re(['todo', 'task', 'reminder', 'remind me', 'agenda'])
+_TODO_LIST_RE = _phrase_re(['show todo', 'list todo', 'my todo', 'my task', 'show task',
+                            'list task', 'show agenda', 'my agenda'])
+_EMAIL_INBOX_RE = _phrase_re([
+    'show me my emails', 'my emails', 'show emails', 'email inbox',
+    'check my emails', 'check emails', 'mcp inbox', 'mcp emails',
+    'show me my mcp', 'my mcp inbox', 'mcp inbox emails'
+])
+
+_FINALIZE_RE = _phrase_re(['finalize', 'save skill', 'save this idea', 'done with idea',
+                           'thats the idea', "that's the idea", 'wrap up', 'lock it in',
+                           'save to doc', 'finalize idea'])
+_SKILL_LIST_RE = _phrase_re(['show skills', 'my skills', 'recent ideas', 'list skills',
+                             'show ideas', 'my ideas', 'recent skills'])
+
+
 class ConversationManager:
     """
     Conversational interface layer for Mode 4.
@@ -350,11 +449,10 @@ class ConversationManager:
         Returns:
             Intent enum value
         """
-        import re
         text_lower = text.lower().strip()
 
         # Remove punctuation for matching (but keep original for later)
-        text_clean = re.sub(r'[^\w\s]', '', text_lower).strip()
+        text_clean = _PUNCTUATION_RE.sub('', text_lower).strip()
 
         # Quick rule-based checks for obvious cases (no LLM needed)
 
@@ -370,15 +468,7 @@ class ConversationManager:
                 tree_result = self._intent_classifier.classify(text_lower)
                 if tree_result and tree_result.confidence >= 0.7:
                     # Map the tree category to our Intent enum
-                    _tree_to_intent = {
-                        "email_action": Intent.EMAIL_DRAFT,
-                        "todo_add": Intent.TODO_ADD,
-                        "idea_bounce": Intent.IDEA_BOUNCE,
-                        "skill_finalize": Intent.SKILL_FINALIZE,
-                        "casual": Intent.CASUAL_CHAT,
-                        "clarification_needed": Intent.UNCLEAR,
-                    }
-                    mapped = _tree_to_intent.get(tree_result.category)
+                    mapped = _TREE_TO_INTENT.get(tree_result.category)
                     if mapped:
                         logger.info(
                             "[INTENT_TREE] Classified '%s' as %s (conf=%.2f)",
@@ -392,89 +482,57 @@ class ConversationManager:
         # These checks MUST come first to prevent conversational text from
         # being mistaken for email searches
 
-        # Greetings (flexible matching - handles "Hello!", "hey there", "Hi!", etc.)
-        greeting_words = ['hi', 'hello', 'hey', 'yo', 'sup', 'hiya', 'heya', 'howdy',
-                         'morning', 'afternoon', 'evening', 'good morning', 'good afternoon',
-                         'good evening', 'gm', 'whats up', 'wassup', "what's up"]
-
         # Check if message IS a greeting (exact or starts with greeting)
-        if text_clean in greeting_words:
+        if text_clean in _GREETING_SET:
             return Intent.GREETING
 
         # Check if message STARTS with a greeting word (e.g., "hey there", "hello mode4")
-        for greeting in greeting_words:
-            if text_clean.startswith(greeting + ' ') or text_clean == greeting:
-                # Make sure it's not followed by email-related words
-                remainder = text_clean[len(greeting):].strip()
-                email_words = ['email', 'draft', 'send', 'reply', 'forward', 'find', 'search']
-                if not any(word in remainder for word in email_words):
-                    return Intent.GREETING
-
-        # Casual chat patterns (more comprehensive)
-        casual_patterns = [
-            "how are you", "how's it going", "hows it going", "how ya doing",
-            "what's up", "whats up", "wassup", "sup",
-            "how's everything", "hows everything",
-            "thanks", "thank you", "thx", "ty",
-            "cool", "nice", "great", "awesome", "ok", "okay", "k",
-            "got it", "understood", "makes sense",
-            "never mind", "nevermind", "nvm", "forget it",
-            "bye", "goodbye", "later", "see ya", "ttyl",
-            "lol", "haha", "hehe"
-        ]
-        if text_clean in casual_patterns or any(text_clean.startswith(p) for p in casual_patterns):
+        if text_clean.startswith(_GREETING_PREFIXES):
+            for greeting in _GREETING_WORDS:
+                if text_clean.startswith(greeting + ' '):
+                    # Make sure it's not followed by email-related words
+                    remainder = text_clean[len(greeting):].strip()
+                    if not _GREETING_EMAIL_WORDS_RE.search(remainder):
+                        return Intent.GREETING
+
+        # Casual chat patterns (exact matches are prefix matches too)
+        if text_clean.startswith(_CASUAL_PREFIXES):
             return Intent.CASUAL_CHAT
 
         # Thanks with context (e.g., "thanks for that", "thank you!")
-        if text_clean.startswith('thank') or text_clean.startswith('thx'):
+        if text_clean.startswith(('thank', 'thx')):
             return Intent.CASUAL_CHAT
 
         # Brainstorm add/show - check BEFORE idea bouncing
-        brainstorm_prefixes = ['brainstorm ', 'brianstorm ', 'branstorm ', 'brain storm ', 'brainstrom ']
-        if any(text_lower.startswith(p) for p in brainstorm_prefixes):
+        if text_lower.startswith(_BRAINSTORM_PREFIXES):
             return Intent.BRAINSTORM_ADD
 
-        brainstorm_show_phrases = ['show brainstorms', 'brainstorms', 'show brainstorm',
-                                   'my brainstorms', 'list brainstorms', 'recent brainstorms']
-        if text_clean in brainstorm_show_phrases or any(text_lower.startswith(p) for p in brainstorm_show_phrases):
+        if text_clean in _BRAINSTORM_SHOW_SET or text_lower.startswith(_BRAINSTORM_SHOW_PHRASES):
             return Intent.BRAINSTORM_SHOW
 
         # Idea bouncing - check BEFORE help requests (since "help me think" contains "help")
-        idea_patterns = ['help me think', 'bounce idea', 'feedback on', 'what do you think',
-                        'think through', 'explore this idea']
-        if any(phrase in text_lower for phrase in idea_patterns):
+        if _IDEA_RE.search(text_lower):
             return Intent.IDEA_BOUNCE
 
-        # Help requests (expanded) - check AFTER idea bouncing
-        help_patterns = ['help', 'what can you do', 'how do i', 'how to', 'what are you',
-                        'what do you do', 'can you help', 'i need help',
-                        'show me how', 'teach me', 'explain', 'instructions']
-        # Exclude "help me think" which is idea bouncing
-        if any(pattern in text_lower for pattern in help_patterns):
-            if not any(idea in text_lower for idea in idea_patterns):
-                return Intent.HELP_REQUEST
+        # Help requests (expanded) - idea phrases already returned above
+        if _HELP_RE.search(text_lower):
+            return Intent.HELP_REQUEST
 
         # Status check patterns
-        if text_clean in ['status', 'whats happening', "what's happening", 'anything new',
-                          'updates', 'what did i miss']:
+        if text_clean in _STATUS_PHRASES:
             return Intent.INFO_STATUS
 
         # === END CONVERSATION GATE ===
 
         # Todo keywords (check BEFORE email to avoid false positives)
-        if any(word in text_lower for word in ['add', 'create', 'new']) and \
-           any(word in text_lower for word in ['todo', 'task', 'reminder', 'remind me', 'agenda']):
+        if _TODO_VERB_RE.search(text_lower) and _TODO_NOUN_RE.search(text_lower):
             return Intent.TODO_ADD
 
-        if any(phrase in text_lower for phrase in ['show todo', 'list todo', 'my todo', 'my task', 'show task', 'list task', 'show agenda', 'my agenda']):
+        if _TODO_LIST_RE.search(text_lower):
             return Intent.TODO_LIST
 
         # MCP Email Inbox - "show me my emails", "my emails", "email inbox", "mcp inbox"
-        if any(phrase in text_lower for phrase in [
-            'show me my emails', 'my emails', 'show emails', 'email inbox',
-            'check my emails', 'check emails', 'mcp inbox', 'mcp emails',
-            'show me my mcp', 'my mcp inbox', 'mcp inbox emails'
-        ]):
+        if _EMAIL_INBOX_RE.search(text_lower):
             return Intent.EMAIL_INBOX
 
         # Email-related keywords
@@ -497,18 +555,10 @@ class ConversationManager:
         if 'unread' in text_lower:
             return Intent.INFO_UNREAD
 
-        # Idea bouncing (already checked above, but keep for LLM fallback path)
-        # This is redundant now but kept for safety
-        if any(phrase in text_lower for phrase in ['help me think', 'bounce idea', 'feedback on', 'what do you think', 'think through']):
-            return Intent.IDEA_BOUNCE
-
         # === SKILL MANAGEMENT ===
 
         # Skill finalization - "finalize", "save this idea", "done with idea"
-        finalize_phrases = ['finalize', 'save skill', 'save this idea', 'done with idea',
-                           'thats the idea', "that's the idea", 'wrap up', 'lock it in',
-                           'save to doc', 'finalize idea']
-        if any(phrase in text_lower for phrase in finalize_phrases):
+        if _FINALIZE_RE.search(text_lower):
             return Intent.SKILL_FINALIZE
 
         # Quick skill capture - "Idea: ...", "Note: ...", "Task: ..."
@@ -516,9 +566,7 @@ class ConversationManager:
             return Intent.SKILL_QUICK
 
         # Skill listing - "show my skills", "recent ideas", "list skills"
-        skill_list_phrases = ['show skills', 'my skills', 'recent ideas', 'list skills',
-                              'show ideas', 'my ideas', 'recent skills']
-        if any(phrase in text_lower for phrase in skill_list_phrases):
+        if _SKILL_LIST_RE.search(text_lower):
             return Intent.SKILL_LIST
 
         # Skill search - "find skill about...", "search ideas"
@@ -533,13 +581,26 @@ class ConversationManager:
         # === END SKILL MANAGEMENT ===
 
         # Casual chat
-        casual_patterns = ["how are you", "what's up", "whats up", "wassup", "how's it going"]
-        if any(pattern in text_lower for pattern in casual_patterns):
+        if _CASUAL_CHAT_RE.search(text_lower):
             return Intent.CASUAL_CHAT
 
         # LLM-based classification for complex cases
         return self._llm_classify_intent(text, context)
 
+    def classify_intents(self, texts: List[str], context: Optional[Dict] = None) -> List[Intent]:
+        """
+        Classify a burst of messages in one call.
+
+        Args:
+            texts: User messages
+            context: Conversation context shared by all messages (optional)
+
+        Returns:
+            Intent enum values, in the same order as texts
+        """
+        classify = self.classify_intent
+        return [classify(text, context) for text in texts]
+
     def _llm_classify_intent(self, text: str, context: Optional[Dict] = None) -> Intent:
         """
         Use LLM for intent classification when rules don't match.
@@ -785,13 +846,7 @@ Just ask naturally and I'll figure out what you need!"""
 
     def _generate_casual_response(self, text: str) -> str:
         """Generate response to casual chat."""
-        responses = [
-            "I'm doing great! How can I help you today?",
-            "All systems running smoothly! What do you need?",
-            "I'm here and ready to help! What's on your agenda?",
-            "Doing well! What can I assist with?",
-        ]
-        return random.choice(responses)
+        return random.choice(_CASUAL_RESPONSES)
 
     def _generate_unclear_response(self) -> str:
         """Generate response when intent is unclear - ask for clarification instead of guessing."""
@@ -3238,63 +3293,49 @@ Just ask naturally and I'll figure out what you need!"""
         We prefer false negatives (miss an email format) over false positives
         (treat conversation as email search).
         """
-        text_lower = text.lower().strip()
-
         # Short messages are almost never legacy email format
         if len(text) < 10:
             return False
 
+        # Every legacy format separates reference and instruction with a dash
+        if '-' not in text:
+            return False
+
+        text_lower = text.lower().strip()
+
         # Pattern 1: Re: subject - instruction (very clear email format)
-        if text_lower.startswith('re:') and '-' in text:
+        if text_lower.startswith('re:'):
             return True
 
         # Pattern 2: From sender - instruction (clear email format)
-        if text_lower.startswith('from ') and '-' in text:
+        if text_lower.startswith('from '):
             # Make sure it looks like "from [name/email]" not "from now on"
             words = text_lower.split()
-            if len(words) >= 2:
-                # Check if second word could be a name/email
-                second_word = words[1] if len(words) > 1 else ''
-                casual_words = ['now', 'here', 'there', 'what', 'where', 'my', 'the', 'this', 'that']
-                if second_word not in casual_words:
-                    return True
+            if len(words) >= 2 and words[1] not in _LEGACY_CASUAL_SECOND_WORDS:
+                return True
 
         # Pattern 3: latest from sender - instruction
-        if text_lower.startswith('latest from') and '-' in text:
+        if text_lower.startswith('latest from'):
             return True
 
         # Pattern 4: STRICT generic format - only if it really looks like email
         # Must have " - " with substantial content on both sides
         # AND must NOT start with conversational words
-        if ' - ' in text:
-            parts = text.split(' - ', 1)
-            if len(parts) == 2:
-                first_part = parts[0].strip()
-                second_part = parts[1].strip()
-
-                first_words = len(first_part.split())
-                second_words = len(second_part.split())
-
-                # Exclude conversational starters
-                conversational_starts = [
-                    'add', 'remind', 'create', 'show', 'list', 'tell', 'give',
-                    'hi', 'hello', 'hey', 'thanks', 'ok', 'cool', 'yes', 'no',
-                    'sure', 'great', 'nice', 'i', 'we', 'you', 'my', 'the',
-                    'what', 'why', 'how', 'when', 'where', 'who', 'can', 'could',
-                    'would', 'should', 'please', 'just', 'actually', 'maybe'
-                ]
-                first_word_lower = first_part.split()[0].lower() if first_part.split() else ''
-                starts_conversational = first_word_lower in conversational_starts
-
-                # Require email-like keywords in the instruction part
-                email_action_words = ['send', 'reply', 'respond', 'draft', 'forward', 'confirm',
-                                      'acknowledge', 'approve', 'reject', 'follow up', 'followup']
-                has_email_action = any(word in second_part.lower() for word in email_action_words)
-
-                # Only match if: 2-10 words on left, has action word, doesn't start conversational
-                if (2 <= first_words <= 10 and second_words >= 1 and
-                    not starts_conversational and has_email_action):
-                    return True
+        first_part, sep, second_part = text.partition(' - ')
+        if sep:
+            first_words = first_part.split()
+            second_part = second_part.strip()
+
+            # Exclude conversational starters
+            starts_conversational = bool(first_words) and first_words[0].lower() in _LEGACY_CONVERSATIONAL_STARTS
+
+            # Require email-like keywords in the instruction part
+            has_email_action = _LEGACY_EMAIL_ACTION_RE.search(second_part.lower()) is not None
+
+            # Only match if: 2-10 words on left, has action word, doesn't start conversational
+            if (2 <= len(first_words) <= 10 and second_part and
+                not starts_conversational and has_email_action):
+                return True
 
         return False
 
@@ -14,6 +14,7 @@ recommendations.  For internal calls (intent classification, data extraction)
 the router auto-selects.
 """
 
+import functools
 import logging
 import os
 import time
@@ -335,6 +336,26 @@ class LLMRouter:
 
 # ── Routing helper (backward-compatible) ─────────────────────────────────────
 
+@functools.lru_cache(maxsize=512)
+def _route_draft(
+    message: str,
+    pattern_confidence: Optional[float],
+    contact_known: bool,
+) -> Tuple[str, str, str]:
+    """
+    Keyword routing for a draft request, memoised because recurring senders
+    and instructions produce the same (llm, reason, recommendation) answer.
+    """
+    router = LLMRouter()
+    recommended_llm, reason = router.analyze(
+        message, pattern_confidence=pattern_confidence, sender_known=contact_known
+    )
+    recommendation_text = router.get_recommendation(
+        message, pattern_confidence=pattern_confidence, sender_known=contact_known
+    )
+    return recommended_llm, reason, recommendation_text
+
+
 def route_draft_request(
     message: str,
     email_data: Dict[str, Any],
@@ -342,8 +363,6 @@ def route_draft_request(
     contact_known: bool = False,
 ) -> Dict[str, Any]:
     """Route a draft request and return routing decision."""
-    router = LLMRouter()
-
     pattern_confidence = None
     if pattern_match:
         boost = pattern_match.get("confidence_boost", 0)
@@ -356,11 +375,8 @@ def route_draft_request(
             score -= 20
         pattern_confidence = max(0, min(100, score)) / 100
 
-    recommended_llm, reason = router.analyze(
-        message, pattern_confidence=pattern_confidence, sender_known=contact_known
-    )
-    recommendation_text = router.get_recommendation(
-        message, pattern_confidence=pattern_confidence, sender_known=contact_known
+    recommended_llm, reason, recommendation_text = _route_draft(
+        message, pattern_confidence, contact_known
     )
 
     return {
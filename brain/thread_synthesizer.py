@@ -6,10 +6,59 @@ Synthesizes multi-email threads into 'State of Play' summaries
 import sqlite3
 import json
 import logging
-from typing import List, Dict, Optional
+import threading
+from typing import Iterator, List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Query messages table for thread history
+# Note: Adjust table/column names if your schema differs
+_THREAD_HISTORY_SQL = '''
+    SELECT sender_name, sender_email, body, received_at, subject
+    FROM messages
+    WHERE thread_id = ?
+    ORDER BY received_at ASC
+    LIMIT ?
+'''
+
+# Lets both queries below range-scan one thread in date order without a sort
+_THREAD_INDEX_SQL = '''
+    CREATE INDEX IF NOT EXISTS idx_messages_thread_date
+    ON messages(thread_id, received_at)
+'''
+
+# Newest message of a thread plus the thread's total message count
+_THREAD_LATEST_SQL = '''
+    SELECT sender_name, received_at, substr(body, 1, 200) AS body,
+           COUNT(*) OVER () AS message_count
+    FROM messages
+    WHERE thread_id = ?
+    ORDER BY received_at DESC
+    LIMIT 1
+'''
+
+# Columns whose values are shared between messages of one thread
+_REPEATED_FIELDS = ("sender_name", "sender_email", "subject")
+
+# Synthesis prompt text around the conversation history
+_SYNTHESIS_PROMPT_HEADER = (
+    "Below is the history of an email thread.\n"
+    "Synthesize this into a 'State of Play' summary for the user.\n"
+    "\n"
+    "CONVERSATION HISTORY:\n"
+)
+_SYNTHESIS_PROMPT_TASK = (
+    "\n"
+    "\n"
+    "YOUR TASK:\n"
+    "1. Summarize the current status of this conversation.\n"
+    "2. List all facts agreed upon (dates, amounts, files, commitments).\n"
+    "3. List open questions the user needs to answer.\n"
+    "4. List open questions the other party needs to answer.\n"
+    "5. Suggest the 'Next Best Action' the user should take."
+)
+
+
 
 class ThreadSynthesizerError(Exception):
     """Exception raised when ThreadSynthesizer encounters an error."""
@@ -32,8 +81,41 @@ class ThreadSynthesizer:
             db_path: Path to the Mode 4 SQLite database
         """
         self.db_path = db_path
+        # One long-lived connection (opened on first query) so repeat lookups
+        # reuse its page cache and prepared statements
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
         logger.info(f"ThreadSynthesizer initialized with database: {db_path}")
 
+    def _connection(self) -> sqlite3.Connection:
+        """Return the shared database connection, opening it if needed."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            try:
+                with conn:
+                    # ANALYZE scans the whole table, so only run it when the
+                    # index is new rather than on every (re)connect
+                    exists = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                        ('idx_messages_thread_date',)
+                    ).fetchone()
+                    if not exists:
+                        conn.execute(_THREAD_INDEX_SQL)
+                        conn.execute("ANALYZE messages")
+            except sqlite3.Error as e:
+                # Read-only database or no messages table yet; queries still work
+                logger.debug(f"Could not index messages table: {e}")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the database connection (reopened on the next query)."""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def get_thread_history(self, thread_id: int, max_messages: int = 50) -> List[Dict]:
         """
         Fetches all messages for a thread ordered by date.
@@ -49,22 +131,21 @@ class ThreadSynthesizer:
             ThreadSynthesizerError: If database query fails
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            # Query messages table for thread history
-            # Note: Adjust table/column names if your schema differs
-            cursor.execute('''
-                SELECT sender_name, sender_email, body, received_at, subject
-                FROM messages
-                WHERE thread_id = ?
-                ORDER BY received_at ASC
-                LIMIT ?
-            ''', (thread_id, max_messages))
-
-            history = [dict(row) for row in cursor.fetchall()]
-            conn.close()
+            with self._conn_lock:
+                rows = self._connection().execute(
+                    _THREAD_HISTORY_SQL, (thread_id, max_messages)
+                ).fetchall()
+
+            # Sender and subject repeat across a thread; share one string each
+            seen: Dict[str, str] = {}
+            history = []
+            for row in rows:
+                message = dict(row)
+                for key in _REPEATED_FIELDS:
+                    value = message[key]
+                    if value:
+                        message[key] = seen.setdefault(value, value)
+                history.append(message)
 
             logger.info(f"Retrieved {len(history)} messages for thread {thread_id}")
             return history
@@ -84,39 +165,65 @@ class ThreadSynthesizer:
         Returns:
             Formatted prompt string for Claude
         """
+        # Joined once, so message bodies are copied a single time
+        return "".join(self.iter_synthesis_prompt(history, custom_instructions))
+
+    def iter_synthesis_prompt(
+        self,
+        history: List[Dict],
+        custom_instructions: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Yields the synthesis prompt in pieces (header, then each message,
+        then the task list), for callers that stream it to an LLM instead
+        of holding the whole prompt in memory.
+
+        Args:
+            history: List of message dicts from get_thread_history()
+            custom_instructions: Optional additional instructions for Claude
+
+        Yields:
+            Consecutive chunks of the prompt from create_synthesis_prompt()
+        """
         if not history:
-            return "No messages found in thread history."
-
-        # Build conversation history text
-        full_text = "\n---\n".join([
-            f"From: {m['sender_name']} ({m['sender_email']})\n"
-            f"Date: {m['received_at']}\n"
-            f"Subject: {m.get('subject', 'N/A')}\n"
-            f"Body: {m['body']}"
-            for m in history
-        ])
-
-        # Base prompt template
-        prompt = f"""
-Below is the history of an email thread.
-Synthesize this into a 'State of Play' summary for the user.
-
-CONVERSATION HISTORY:
-{full_text}
-
-YOUR TASK:
-1. Summarize the current status of this conversation.
-2. List all facts agreed upon (dates, amounts, files, commitments).
-3. List open questions the user needs to answer.
-4. List open questions the other party needs to answer.
-5. Suggest the 'Next Best Action' the user should take.
-"""
+            yield "No messages found in thread history."
+            return
+
+        yield _SYNTHESIS_PROMPT_HEADER
+        separator = ""
+        for m in history:
+            yield (
+                f"{separator}From: {m['sender_name']} ({m['sender_email']})\n"
+                f"Date: {m['received_at']}\n"
+                f"Subject: {m.get('subject', 'N/A')}\n"
+                f"Body: "
+            )
+            yield format(m['body'])
+            separator = "\n---\n"
+        yield _SYNTHESIS_PROMPT_TASK
 
         # Add custom instructions if provided
         if custom_instructions:
-            prompt += f"\n\nADDITIONAL INSTRUCTIONS:\n{custom_instructions}"
+            yield f"\n\n\nADDITIONAL INSTRUCTIONS:\n{custom_instructions}".rstrip()
+
+    def _latest_message_and_count(self, thread_id: int) -> Tuple[Optional[Dict], int]:
+        """
+        Fetch the newest message of a thread (body cut to 200 characters)
+        and the thread's message count in one query.
+
+        Raises:
+            ThreadSynthesizerError: If database query fails
+        """
+        try:
+            with self._conn_lock:
+                row = self._connection().execute(_THREAD_LATEST_SQL, (thread_id,)).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Database error fetching thread {thread_id}: {e}")
+            raise ThreadSynthesizerError(f"Failed to fetch thread history: {str(e)}")
 
-        return prompt.strip()
+        if row is None:
+            return None, 0
+        return dict(row), row['message_count']
 
     def get_thread_summary_preview(self, thread_id: int, max_chars: int = 500) -> str:
         """
@@ -132,19 +239,18 @@ YOUR TASK:
             Preview string of thread content
         """
         try:
-            history = self.get_thread_history(thread_id, max_messages=10)
+            latest, message_count = self._latest_message_and_count(thread_id)
 
-            if not history:
+            if latest is None:
                 return f"Thread {thread_id} has no messages."
 
             preview_lines = [
-                f"Thread with {len(history)} messages",
-                f"Latest: {history[-1]['sender_name']} - {history[-1]['received_at']}"
+                f"Thread with {message_count} messages",
+                f"Latest: {latest['sender_name']} - {latest['received_at']}"
             ]
 
-            # Add snippet of latest message
-            latest_body = history[-1]['body'][:200]
-            preview_lines.append(f"Preview: {latest_body}...")
+            # Add snippet of latest message (already cut to 200 chars)
+            preview_lines.append(f"Preview: {latest['body']}...")
 
             preview = "\n".join(preview_lines)
 
@@ -5,10 +5,11 @@ Settings for Telegram bot, Gmail, Sheets, and Ollama integration.
 
 
 
+import os
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
-    import os
     
     # 1. Get the folder where this file is (core/Infrastructure)
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -108,6 +109,16 @@ TELEGRAM_ALLOWED_USERS = [int(x.strip()) for x in _allowed_users_str.strip('[]')
 # Chat ID to send notifications to
 TELEGRAM_ADMIN_CHAT_ID = int(os.getenv('TELEGRAM_ADMIN_CHAT_ID')) if os.getenv('TELEGRAM_ADMIN_CHAT_ID') else None
 
+# Outbound rate limits (Telegram caps bots at ~30 msg/s overall, ~1 msg/s per chat;
+# the global limit keeps a little headroom under the cap)
+TELEGRAM_GLOBAL_MSGS_PER_SECOND = 28
+TELEGRAM_PER_CHAT_MSGS_PER_SECOND = 1
+
+# Optional local Bot API server (telegram-bot-api --local) to avoid the WAN
+# round-trip to api.telegram.org, e.g. http://127.0.0.1:8081/bot
+TELEGRAM_BASE_URL = os.getenv('TELEGRAM_BASE_URL')
+TELEGRAM_BASE_FILE_URL = os.getenv('TELEGRAM_BASE_FILE_URL')
+
 
 # ============================================
 # GMAIL API (Legacy/Fallback)
@@ -410,13 +421,17 @@ def load_telegram_config():
             return {
                 'bot_token': config.get('bot_token', TELEGRAM_BOT_TOKEN),
                 'allowed_users': config.get('allowed_users', TELEGRAM_ALLOWED_USERS),
-                'admin_chat_id': config.get('admin_chat_id', TELEGRAM_ADMIN_CHAT_ID)
+                'admin_chat_id': config.get('admin_chat_id', TELEGRAM_ADMIN_CHAT_ID),
+                'base_url': config.get('base_url', TELEGRAM_BASE_URL),
+                'base_file_url': config.get('base_file_url', TELEGRAM_BASE_FILE_URL)
             }
 
     return {
         'bot_token': TELEGRAM_BOT_TOKEN,
         'allowed_users': TELEGRAM_ALLOWED_USERS,
-        'admin_chat_id': TELEGRAM_ADMIN_CHAT_ID
+        'admin_chat_id': TELEGRAM_ADMIN_CHAT_ID,
+        'base_url': TELEGRAM_BASE_URL,
+        'base_file_url': TELEGRAM_BASE_FILE_URL
     }
 
 
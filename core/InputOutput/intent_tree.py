@@ -19,11 +19,17 @@ import logging
 import os
 import re
 import time
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+# Most recent context-free classify() results kept per classifier
+_CLASSIFY_CACHE_SIZE = 512
+# Input beyond this many characters is ignored (Telegram's message limit)
+_MAX_CLASSIFY_CHARS = 4096
+
 # ── Result type ──────────────────────────────────────────────────────────────
 
 IntentResult = namedtuple(
@@ -34,6 +40,21 @@ IntentResult = namedtuple(
 
 # ── Decision Node ────────────────────────────────────────────────────────────
 
+def _compile_pattern(pattern: str) -> Optional["re.Pattern"]:
+    """Compile a config regex case-insensitively; log and skip it if invalid."""
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error as exc:
+        logger.warning("Ignoring invalid intent tree regex %r: %s", pattern, exc)
+        return None
+
+
+def _normalise(text: str) -> tuple:
+    """Return (lowercased, lowercased without punctuation) forms of *text*."""
+    text_lower = text.lower().strip()
+    return text_lower, _PUNCTUATION_RE.sub("", text_lower).strip()
+
+
 class DecisionNode:
     """
     A single node in the decision tree.
@@ -50,6 +71,13 @@ class DecisionNode:
         confidence:     Base confidence assigned at this leaf (0.0–1.0).
     """
 
+    # Trees are long-lived and walked on every classify(); no per-node __dict__
+    __slots__ = (
+        "name", "condition_type", "condition_data", "true_branch", "false_branch",
+        "action", "extract_params", "follow_up", "confidence",
+        "_keyword_re", "_regexes", "_extract_rules",
+    )
+
     def __init__(
         self,
         name: str = "",
@@ -72,30 +100,49 @@ class DecisionNode:
         self.follow_up = follow_up
         self.confidence = confidence
 
+        # Patterns are compiled once here rather than on every classify()
+        # All keywords share one word-bounded alternation, so a single scan
+        # answers "does any keyword occur"
+        self._keyword_re: Optional["re.Pattern"] = None
+        if condition_type == "keywords" and isinstance(self.condition_data, list) and self.condition_data:
+            self._keyword_re = re.compile(
+                r"\b(?:" + "|".join(map(re.escape, self.condition_data)) + r")\b"
+            )
+        self._regexes: List["re.Pattern"] = []
+        if condition_type == "regex":
+            patterns = self.condition_data
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            self._regexes = [
+                compiled for compiled in map(_compile_pattern, patterns) if compiled
+            ]
+        self._extract_rules: List[tuple] = []
+        for rule in self.extract_params:
+            pattern = rule.get("pattern")
+            param_name = rule.get("param")
+            if pattern and param_name:
+                compiled = _compile_pattern(pattern)
+                if compiled:
+                    self._extract_rules.append((compiled, param_name))
+
     # ── evaluation ───────────────────────────────────────────────────────
 
     def evaluate(self, text: str, context: Dict[str, Any]) -> bool:
         """Return True if *text* satisfies this node's condition."""
-        text_lower = text.lower().strip()
-        text_clean = re.sub(r"[^\w\s]", "", text_lower).strip()
+        text_lower, text_clean = _normalise(text)
+        return self._matches(text_lower, text_clean, context)
 
+    def _matches(self, text_lower: str, text_clean: str, context: Dict[str, Any]) -> bool:
+        """Condition check on text already normalised by _normalise()."""
         if self.condition_type == "always_true":
             return True
 
         if self.condition_type == "keywords":
-            keywords = self.condition_data
-            if isinstance(keywords, list):
-                return any(
-                    re.search(r"\b" + re.escape(kw) + r"\b", text_clean)
-                    for kw in keywords
-                )
-            return False
+            keyword_re = self._keyword_re
+            return keyword_re is not None and keyword_re.search(text_clean) is not None
 
         if self.condition_type == "regex":
-            patterns = self.condition_data
-            if isinstance(patterns, str):
-                patterns = [patterns]
-            return any(re.search(p, text_lower, re.IGNORECASE) for p in patterns)
+            return any(p.search(text_lower) for p in self._regexes)
 
         if self.condition_type == "starts_with":
             prefixes = self.condition_data
@@ -114,16 +161,13 @@ class DecisionNode:
     def extract(self, text: str) -> Dict[str, Any]:
         """Run extraction rules against *text* and return captured params."""
         params: Dict[str, Any] = {}
-        for rule in self.extract_params:
-            pattern = rule.get("pattern")
-            param_name = rule.get("param")
-            if pattern and param_name:
-                m = re.search(pattern, text, re.IGNORECASE)
-                if m:
-                    try:
-                        params[param_name] = m.group(1).strip()
-                    except IndexError:
-                        params[param_name] = m.group(0).strip()
+        for pattern, param_name in self._extract_rules:
+            m = pattern.search(text)
+            if m:
+                try:
+                    params[param_name] = m.group(1).strip()
+                except IndexError:
+                    params[param_name] = m.group(0).strip()
         return params
 
     # ── serialisation helpers ────────────────────────────────────────────
@@ -177,12 +221,17 @@ class IntentClassifier:
         self._root: Optional[DecisionNode] = None
         self._config: Dict[str, Any] = {}
         self._load_time: float = 0.0
+        # text -> IntentResult for context-free calls, LRU ordered
+        self._cache: "OrderedDict[str, IntentResult]" = OrderedDict()
+        # Result for empty / whitespace-only input, rebuilt on every load
+        self._empty_result: Optional[IntentResult] = None
         self._load()
 
     # ── loading ──────────────────────────────────────────────────────────
 
     def _load(self):
         """Load (or reload) the tree from the JSON config file."""
+        self._cache.clear()
         try:
             with open(self._config_path, "r") as fh:
                 self._config = json.load(fh)
@@ -205,6 +254,8 @@ class IntentClassifier:
             self._root = self._build_default_tree()
             self._load_time = time.time()
 
+        self._empty_result = self._classify("", {})
+
     def reload_if_changed(self):
         """Reload config if the file has been modified since last load."""
         try:
@@ -220,6 +271,11 @@ class IntentClassifier:
         """
         Walk the decision tree and return an IntentResult.
 
+        Results for calls without context are cached per exact text
+        (cleared when the config is reloaded); empty or whitespace-only
+        input returns a result computed at load time. Only the first
+        4096 characters of *text* are considered.
+
         Args:
             text:    Raw user input.
             context: Dict with optional keys like ``active_tasks``,
@@ -228,15 +284,55 @@ class IntentClassifier:
         Returns:
             IntentResult(category, confidence, parameters, follow_up_question)
         """
-        if context is None:
-            context = {}
+        if len(text) > _MAX_CLASSIFY_CHARS:
+            text = text[:_MAX_CLASSIFY_CHARS]
+
+        if context:
+            return self._classify(text, context)
+
+        if not text or text.isspace():
+            result = self._empty_result
+            return result._replace(parameters=dict(result.parameters))
+
+        # Without context the result depends only on the text, so repeats
+        # are served from the LRU cache
+        cache = self._cache
+        result = cache.get(text)
+        if result is None:
+            result = cache[text] = self._classify(text, {})
+            if len(cache) > _CLASSIFY_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(text)
+        # Callers get their own parameters dict
+        return result._replace(parameters=dict(result.parameters))
+
+    def classify_many(
+        self, texts: List[str], context: Optional[Dict[str, Any]] = None
+    ) -> List[IntentResult]:
+        """
+        Classify a batch of inputs, e.g. to warm the cache or replay a log.
+
+        Args:
+            texts:   Raw user inputs.
+            context: Context shared by every input (optional).
+
+        Returns:
+            One IntentResult per input, in order.
+        """
+        classify = self.classify
+        return [classify(text, context) for text in texts]
 
+    def _classify(self, text: str, context: Dict[str, Any]) -> IntentResult:
+        """Walk the tree for *text* (uncached)."""
         if self._root is None:
             return IntentResult("clarification_needed", 0.0, {}, "I couldn't classify that. What would you like to do?")
 
         node = self._root
         depth = 0
         max_depth = 30  # prevent infinite loops in malformed trees
+        # Normalise once; every interior node tests the same strings
+        text_lower, text_clean = _normalise(text)
 
         while node and depth < max_depth:
             depth += 1
@@ -265,7 +361,7 @@ class IntentClassifier:
                 )
 
             # Interior node – branch
-            if node.evaluate(text, context):
+            if node._matches(text_lower, text_clean, context):
                 node = node.true_branch
             else:
                 node = node.false_branch
@@ -324,6 +324,7 @@ class Mode4Processor:
         name: str,
         coro_factory: Callable[[], Coroutine],
         restart_delay: float = 5.0,
+        stopped: Optional[Callable[[], bool]] = None,
     ):
         """
         Run a coroutine with automatic restart on crash.
@@ -335,11 +336,17 @@ class Mode4Processor:
             name: Human-readable task name for logging.
             coro_factory: Zero-arg callable that returns a coroutine.
             restart_delay: Seconds to wait before restarting after crash.
+            stopped: Optional zero-arg callable; when it returns True after
+                the coroutine returns, the service was stopped on purpose
+                and is not restarted.
         """
         while True:
             try:
                 logger.info("Starting supervised task: %s", name)
                 await coro_factory()
+                if stopped is not None and stopped():
+                    logger.info("Supervised task %s stopped", name)
+                    return
             except asyncio.CancelledError:
                 logger.info("Supervised task %s cancelled", name)
                 raise
@@ -866,9 +873,10 @@ class Mode4Processor:
                 # Telegram listener (primary service)
                 tg.create_task(self._supervised(
                     "telegram",
-                    lambda: self.telegram.run_async(
+                    lambda: self.telegram.run_until_stopped(
                         message_callback=self.process_message
                     ),
+                    stopped=lambda: self.telegram.stopped,
                 ))
 
                 # M365 sync loop (conditional)
@@ -1048,6 +1056,11 @@ class Mode4Processor:
 
         except Exception as e:
             logger.error(f"Error processing startup queue: {e}")
+        finally:
+            # run() calls this under its own asyncio.run loop: deliver queued
+            # sends and notifications before that loop closes
+            if self._telegram is not None:
+                await self._telegram.flush_async()
 
     def _validate_config(self) -> list:
         """Validate configuration before starting."""
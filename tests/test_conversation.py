@@ -75,8 +75,9 @@ def test_intent_classification():
     print("Testing Intent Classification")
     print("=" * 60)
 
-    for text, expected_intent in test_cases:
-        result = conv_mgr.classify_intent(text)
+    results = conv_mgr.classify_intents([text for text, _ in test_cases])
+
+    for (text, expected_intent), result in zip(test_cases, results):
         status = "✓" if result == expected_intent else "✗"
 
         if result == expected_intent:
@@ -5,6 +5,7 @@ Verifies that the IntentClassifier correctly routes user inputs to the
 expected categories with appropriate confidence and parameter extraction.
 """
 
+import functools
 import os
 import sys
 import unittest
@@ -18,7 +19,9 @@ for _d in ["brain","core","core/Infrastructure","core/InputOutput","core/State&M
 from intent_tree import IntentClassifier, IntentResult, DecisionNode
 
 
+@functools.lru_cache(maxsize=None)
 def _classifier():
+    # Loaded once and shared: tests only read from the classifier
     return IntentClassifier()
 
 
@@ -168,6 +171,13 @@ class TestIntentResult(unittest.TestCase):
         self.assertTrue(hasattr(result, "parameters"))
         self.assertTrue(hasattr(result, "follow_up_question"))
 
+    def test_classify_many_matches_classify(self):
+        texts = ["hello", "draft email to John about the meeting", "make a spreadsheet"]
+        self.assertEqual(
+            self.classifier.classify_many(texts),
+            [self.classifier.classify(t) for t in texts],
+        )
+
     def test_result_is_namedtuple(self):
         result = self.classifier.classify("Hello")
         self.assertIsInstance(result, IntentResult)
@@ -209,6 +219,14 @@ class TestDecisionNode(unittest.TestCase):
         self.assertTrue(node.evaluate("email John about meeting", {}))
         self.assertFalse(node.evaluate("hello there", {}))
 
+    def test_invalid_regex_is_ignored(self):
+        node = DecisionNode(
+            condition_type="regex",
+            condition_data=[r"email(", r"sheet\s+for"],
+        )
+        self.assertTrue(node.evaluate("sheet for Q3", {}))
+        self.assertFalse(node.evaluate("email(", {}))
+
     def test_extract_params(self):
         node = DecisionNode(
             extract_params=[
@@ -245,6 +263,9 @@ class TestEdgeCases(unittest.TestCase):
         result = self.classifier.classify("")
         self.assertIsNotNone(result.category)
 
+    def test_whitespace_only_matches_empty(self):
+        self.assertEqual(self.classifier.classify("  \n\t"), self.classifier.classify(""))
+
     def test_very_long_input(self):
         result = self.classifier.classify("hello " * 1000)
         self.assertIsNotNone(result.category)
@@ -253,6 +274,13 @@ class TestEdgeCases(unittest.TestCase):
         result = self.classifier.classify("email!!! @#$ John??")
         self.assertIsNotNone(result.category)
 
+    def test_repeat_classify_returns_independent_params(self):
+        first = self.classifier.classify("Email John about the meeting")
+        first.parameters["recipient"] = "changed"
+        second = self.classifier.classify("Email John about the meeting")
+        self.assertEqual(second.category, first.category)
+        self.assertNotEqual(second.parameters.get("recipient"), "changed")
+
     def test_none_context(self):
         result = self.classifier.classify("Hello", context=None)
         self.assertEqual(result.category, "casual")
@@ -0,0 +1,133 @@
+"""
+Tests for the legacy (regex) message parser in TelegramHandler.
+
+Runs without python-telegram-bot installed: the handler is created with
+__new__ and SmartParser is disabled so only the legacy patterns are used.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _d in ["brain","core","core/Infrastructure","core/InputOutput","core/State&Memory","Bot_actions","LLM"]:
+    _p = os.path.join(_root, _d)
+    if _p not in sys.path: sys.path.insert(0, _p)
+
+import telegram_handler
+from telegram_handler import TelegramHandler
+
+
+class TestLegacyParsing(unittest.TestCase):
+    def setUp(self):
+        self.handler = TelegramHandler.__new__(TelegramHandler)
+        self.handler.processor = None
+        patcher = mock.patch.object(telegram_handler, 'SMART_PARSER_ENABLED', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _parse(self, text):
+        return self.handler.parse_message(text)
+
+    def test_reply_subject(self):
+        result = self._parse("Re: W9 Request - send W9 and wiring instructions")
+        self.assertTrue(result['valid'])
+        self.assertEqual(result['search_type'], 'subject')
+        self.assertEqual(result['email_reference'], 'W9 Request')
+        self.assertEqual(result['instruction'], 'send W9 and wiring instructions')
+
+    def test_uppercase_prefix_is_generic(self):
+        result = self._parse("RE: W9 Request - send it")
+        self.assertEqual(result['search_type'], 'keyword')
+        self.assertEqual(result['email_reference'], 'RE: W9 Request')
+
+    def test_from_sender(self):
+        result = self._parse("From john@example.com - confirm payment received")
+        self.assertEqual(result['search_type'], 'sender')
+        self.assertEqual(result['email_reference'], 'john@example.com')
+        self.assertEqual(result['instruction'], 'confirm payment received')
+
+    def test_latest_from_sender(self):
+        result = self._parse("latest from sarah@company.com – schedule meeting")
+        self.assertEqual(result['search_type'], 'sender')
+        self.assertEqual(result['email_reference'], 'sarah@company.com')
+        self.assertEqual(result['instruction'], 'schedule meeting')
+
+    def test_generic_keyword(self):
+        result = self._parse("Budget Q4 - approve the numbers")
+        self.assertEqual(result['search_type'], 'keyword')
+        self.assertEqual(result['email_reference'], 'Budget Q4')
+        self.assertEqual(result['instruction'], 'approve the numbers')
+
+    def test_generic_splits_at_first_dash(self):
+        result = self._parse("W-9 form - send it")
+        self.assertEqual(result['email_reference'], 'W')
+        self.assertEqual(result['instruction'], '9 form - send it')
+
+    def test_generic_multiline_reference(self):
+        result = self._parse("Budget Q4\n- approve the numbers")
+        self.assertEqual(result['email_reference'], 'Budget Q4')
+        self.assertEqual(result['instruction'], 'approve the numbers')
+
+    def test_generic_with_email_is_sender(self):
+        result = self._parse("bob@corp.com — follow up")
+        self.assertEqual(result['search_type'], 'sender')
+        self.assertEqual(result['email_reference'], 'bob@corp.com')
+
+    def test_command(self):
+        result = self._parse("/Status now")
+        self.assertTrue(result['valid'])
+        self.assertEqual(result['command'], '/status')
+        self.assertEqual(result['args'], 'now')
+
+    def test_command_args_after_newline(self):
+        result = self._parse("/retry\n  abc123")
+        self.assertEqual(result['command'], '/retry')
+        self.assertEqual(result['args'], 'abc123')
+
+    def test_command_without_args(self):
+        result = self._parse("/help")
+        self.assertEqual(result['command'], '/help')
+        self.assertEqual(result['args'], '')
+
+    def test_plain_text_falls_back_to_keyword(self):
+        result = self._parse("  just some random text ")
+        self.assertTrue(result['valid'])
+        self.assertEqual(result['email_reference'], 'just some random text')
+        self.assertEqual(result['instruction'], 'respond appropriately')
+        self.assertEqual(result['search_type'], 'keyword')
+
+    def test_empty_is_invalid(self):
+        self.assertFalse(self._parse("   ")['valid'])
+
+
+class TestHtmlSplitting(unittest.TestCase):
+    def test_plain_text_matches_split_message(self):
+        text = "line one\nline two\n" + "x" * 50
+        self.assertEqual(
+            telegram_handler._split_html_message(text, 20),
+            telegram_handler._split_message(text, 20)
+        )
+
+    def test_tags_are_closed_and_reopened(self):
+        parts = telegram_handler._split_html_message("<b>" + "a" * 30 + "</b>", 20)
+        self.assertEqual(parts, ["<b>" + "a" * 13 + "</b>", "<b>" + "a" * 13 + "</b>", "<b>aaaa</b>"])
+
+    def test_nested_tags_reopen_in_order(self):
+        parts = telegram_handler._split_html_message('<i>x <a href="u">' + "y" * 40 + "</a></i>", 40)
+        self.assertTrue(all(len(part) <= 40 for part in parts))
+        self.assertTrue(parts[1].startswith('<i><a href="u">'))
+        self.assertTrue(parts[0].endswith("</a></i>"))
+
+    def test_entities_are_not_cut(self):
+        parts = telegram_handler._split_html_message("&amp;" * 10, 12)
+        self.assertEqual(parts, ["&amp;&amp;"] * 5)
+
+    def test_prefers_line_breaks(self):
+        parts = telegram_handler._split_html_message("<b>head</b>\n" + "z" * 15, 20)
+        self.assertEqual(parts, ["<b>head</b>", "z" * 15])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+"""
+Tests for the outbound send queues and notification coalescing in
+TelegramHandler.
+
+Runs without python-telegram-bot installed: the handler is created with
+__new__ and given a fake bot that records the calls it receives.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _d in ["brain","core","core/Infrastructure","core/InputOutput","core/State&Memory","Bot_actions","LLM"]:
+    _p = os.path.join(_root, _d)
+    if _p not in sys.path: sys.path.insert(0, _p)
+
+import telegram_handler
+from telegram_handler import TelegramHandler, TelegramHandlerError
+
+
+class FakeRetryAfter(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Flood control exceeded, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class FakeBot:
+    """Records sent texts; delays[text] makes that call sleep first."""
+
+    def __init__(self):
+        self.sent = []
+        self.delays = {}
+        self.failures = []
+
+    async def send_message(self, **kwargs):
+        await asyncio.sleep(self.delays.get(kwargs['text'], 0))
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append((kwargs['chat_id'], kwargs['text']))
+        return kwargs
+
+    async def edit_message_text(self, **kwargs):
+        self.sent.append((kwargs['chat_id'], kwargs['text']))
+        return kwargs
+
+
+def _make_handler(per_chat_rate=1000):
+    handler = TelegramHandler.__new__(TelegramHandler)
+    handler.bot = FakeBot()
+    handler.admin_chat_id = None
+    handler._allowed_users_set = frozenset()
+    handler._authorized_chats = set()
+    handler._send_lanes = {}
+    handler._send_workers = set()
+    handler._send_credit = None
+    handler._send_slots = None
+    handler._send_loop = None
+    handler._global_limiter = telegram_handler._AsyncRateLimiter(1000, 1.0)
+    handler._per_chat_rate = per_chat_rate
+    handler._chat_limiters = OrderedDict()
+    handler._pending_notifications = {}
+    handler._flush_tasks = {}
+    return handler
+
+
+class TestSendQueue(unittest.TestCase):
+    def setUp(self):
+        self.handler = _make_handler()
+        patcher = mock.patch.object(telegram_handler, 'RetryAfter', FakeRetryAfter, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_per_chat_order_is_kept(self):
+        bot = self.handler.bot
+        # Earlier messages are slower, so concurrent sends would reorder them
+        bot.delays = {f"a{i}": 0.01 * (5 - i) for i in range(5)}
+
+        async def run():
+            futures = []
+            for i in range(5):
+                futures.append(await self.handler._submit_send(chat_id=1, text=f"a{i}"))
+                futures.append(await self.handler._submit_send(chat_id=2, text=f"b{i}"))
+            await asyncio.gather(*futures)
+
+        asyncio.run(run())
+        self.assertEqual([text for chat, text in bot.sent if chat == 1], [f"a{i}" for i in range(5)])
+        self.assertEqual([text for chat, text in bot.sent if chat == 2], [f"b{i}" for i in range(5)])
+
+    def test_edits_share_the_chat_queue(self):
+        bot = self.handler.bot
+        bot.delays = {"first": 0.02}
+
+        async def run():
+            first = await self.handler._submit_send(chat_id=1, text="first")
+            edit = await self.handler._submit_send('edit_message_text', chat_id=1, message_id=7, text="edit")
+            await asyncio.gather(first, edit)
+
+        asyncio.run(run())
+        self.assertEqual(bot.sent, [(1, "first"), (1, "edit")])
+
+    def test_cancelled_worker_resolves_every_future(self):
+        self.handler.bot.delays = {"m0": 10}
+
+        async def run():
+            futures = [await self.handler._submit_send(chat_id=1, text=f"m{i}") for i in range(3)]
+            await asyncio.sleep(0.01)
+            workers = list(self.handler._send_workers)
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            return futures
+
+        futures = asyncio.run(run())
+        for future in futures:
+            self.assertTrue(future.done())
+            self.assertIsInstance(future.exception(), TelegramHandlerError)
+        self.assertEqual(self.handler._send_lanes, {})
+
+    def test_futures_fail_when_the_loop_closes(self):
+        self.handler.bot.delays = {"m0": 10}
+
+        async def run():
+            return [await self.handler._submit_send(chat_id=1, text=f"m{i}") for i in range(2)]
+
+        for future in asyncio.run(run()):
+            self.assertIsInstance(future.exception(), TelegramHandlerError)
+
+    def test_retry_after_is_retried(self):
+        bot = self.handler.bot
+        bot.failures = [FakeRetryAfter(0.01)]
+
+        async def run():
+            return await self.handler.send_response(1, "hello")
+
+        with self.assertLogs(telegram_handler.logger, 'WARNING'):
+            result = asyncio.run(run())
+        self.assertEqual(result['text'], "hello")
+        self.assertEqual(bot.sent, [(1, "hello")])
+
+    def test_send_errors_reach_the_caller(self):
+        self.handler.bot.failures = [RuntimeError("boom")]
+
+        async def run():
+            await self.handler.send_response(1, "hello")
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run())
+
+    def test_sends_work_on_a_new_event_loop(self):
+        async def run(text):
+            return await self.handler.send_response(1, text)
+
+        asyncio.run(run("first"))
+        asyncio.run(run("second"))
+        self.assertEqual(self.handler.bot.sent, [(1, "first"), (1, "second")])
+
+
+class TestNotifications(unittest.TestCase):
+    def setUp(self):
+        self.handler = _make_handler()
+
+    def test_notifications_in_window_are_merged(self):
+        bot = self.handler.bot
+
+        async def run():
+            await self.handler.send_error_notification(1, "ref-1", "first")
+            await self.handler.send_error_notification(1, "ref-2", "second")
+            await asyncio.sleep(telegram_handler._COALESCE_WINDOW + 0.1)
+            await self.handler.flush_async()
+
+        with mock.patch.object(telegram_handler, '_COALESCE_WINDOW', 0.01):
+            asyncio.run(run())
+        self.assertEqual(len(bot.sent), 1)
+        text = bot.sent[0][1]
+        self.assertIn(telegram_handler._DIGEST_SEPARATOR, text)
+        self.assertIn("ref-1", text)
+        self.assertIn("ref-2", text)
+
+    def test_flush_async_drains_before_loop_closes(self):
+        bot = self.handler.bot
+
+        async def run():
+            await self.handler.send_error_notification(1, "ref", "boom")
+            await self.handler.send_response(2, "queued", wait=False)
+            await self.handler.flush_async()
+
+        asyncio.run(run())
+        self.assertEqual(sorted(chat for chat, _ in bot.sent), [1, 2])
+        self.assertEqual(self.handler._pending_notifications, {})
+
+    def test_notifications_reach_chats_used_by_allowed_users(self):
+        handler = self.handler
+        handler._allowed_users_set = frozenset({42})
+        handler.admin_chat_id = -100
+
+        async def run():
+            await handler.send_error_notification(-500, "ref", "unknown group")
+            handler._is_authorized(42, -600)
+            await handler.send_error_notification(-600, "ref", "group")
+            await handler.send_error_notification(-100, "ref", "admin")
+            await handler.send_error_notification(42, "ref", "user")
+            await handler.flush_async()
+
+        with self.assertLogs(telegram_handler.logger, 'WARNING'):
+            asyncio.run(run())
+        self.assertEqual(sorted(chat for chat, _ in handler.bot.sent), [-600, -100, 42])
+
+    def test_unauthorized_user_does_not_authorize_chat(self):
+        self.handler._allowed_users_set = frozenset({42})
+        self.assertFalse(self.handler._is_authorized(7, -600))
+        self.assertNotIn(-600, self.handler._authorized_chats)
+
+    def test_notification_cancelled_with_its_loop_is_sent(self):
+        async def run():
+            await self.handler.send_error_notification(1, "ref", "boom")
+
+        asyncio.run(run())
+        self.assertEqual(len(self.handler.bot.sent), 1)
+        self.assertEqual(self.handler._flush_tasks, {})
+
+
+if __name__ == "__main__":
+    unittest.main()